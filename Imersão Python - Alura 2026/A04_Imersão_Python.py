@@ -1,6 +1,14 @@
-import pandas as pd
+import time
+
+INICIO_SCRIPT = time.perf_counter()
+
 import streamlit as st
-import plotly.express as px
+
+from agregados_salarios import AgregadosSalarios
+from cambio_salarios import MOEDAS_EXIBICAO, SIMBOLOS, TabelaCambio
+from dados_salarios import REVALIDAR_A_CADA, carregar_salarios
+from filtros_salarios import IndiceFiltros
+from tabela_salarios import LINHAS_POR_PAGINA, TabelaSalarios, total_paginas
 
 # --- Configuração da Página ---
 # Define o título da página, o ícone e o layout para ocupar a largura inteira.
@@ -10,127 +18,234 @@ st.set_page_config(
     layout="wide",
 )
 # --- Carregamento dos dados ---
-df = pd.read_csv("https://raw.githubusercontent.com/vqrca/dashboard_salarios_dados/refs/heads/main/dados-imersao-final.csv")
+# O CSV fica em cache no disco (Parquet) e na memória do processo; os reruns não baixam nada.
+# cache_resource não copia o DataFrame a cada rerun (o dashboard só lê, nunca altera o df).
+# O índice dos filtros, a tabela e o câmbio são montados junto, uma vez por versão dos
+# dados (ver filtros_salarios.py, tabela_salarios.py e cambio_salarios.py).
+@st.cache_resource(ttl=REVALIDAR_A_CADA, show_spinner="Carregando dados...")
+def carregar_dados():
+    df = carregar_salarios()
+    indice = IndiceFiltros(df)
+    return df, indice, TabelaSalarios(df), TabelaCambio.carregar(df), time.time()
+
+
+# Agregados (ver agregados_salarios.py) por moeda de exibição. Em USD usamos a coluna usd dos
+# dados; nas outras moedas o salário é convertido uma vez (busca na tabela de câmbio e uma
+# multiplicação) e, depois do primeiro uso, trocar de moeda é instantâneo.
+@st.cache_resource(ttl=REVALIDAR_A_CADA, max_entries=2 * len(MOEDAS_EXIBICAO), show_spinner=False)
+def obter_agregados(_df, _indice, _cambio, versao, moeda):
+    if moeda == "USD":
+        return AgregadosSalarios(_df, _indice)
+    colunas = list(_indice.opcoes) + ["cargo", "remoto", "residencia_iso3"]
+    convertido = _df[colunas].assign(valor=_cambio.converter(_df, moeda))
+    return AgregadosSalarios(convertido, _indice, coluna_valor="valor")
+
+
+df, indice_filtros, tabela, cambio, versao_dados = carregar_dados()
 
 # --- Barra Lateral (Filtros) ---
 st.sidebar.header("🔍 Filtros")
 
 # Filtro de Ano
-anos_disponiveis = sorted(df['ano'].unique())
+anos_disponiveis = indice_filtros.opcoes['ano']
 anos_selecionados = st.sidebar.multiselect("Ano", anos_disponiveis, default=anos_disponiveis)
 
 # Filtro de Senioridade
-senioridades_disponiveis = sorted(df['senioridade'].unique())
+senioridades_disponiveis = indice_filtros.opcoes['senioridade']
 senioridades_selecionadas = st.sidebar.multiselect("Senioridade", senioridades_disponiveis, default=senioridades_disponiveis)
 
 # Filtro por Tipo de Contrato
-contratos_disponiveis = sorted(df['contrato'].unique())
+contratos_disponiveis = indice_filtros.opcoes['contrato']
 contratos_selecionados = st.sidebar.multiselect("Tipo de Contrato", contratos_disponiveis, default=contratos_disponiveis)
 
 # Filtro por Tamanho da Empresa
-tamanhos_disponiveis = sorted(df['tamanho_empresa'].unique())
+tamanhos_disponiveis = indice_filtros.opcoes['tamanho_empresa']
 tamanhos_selecionados = st.sidebar.multiselect("Tamanho da Empresa", tamanhos_disponiveis, default=tamanhos_disponiveis)
 
+# Moeda de exibição dos salários
+moeda = st.sidebar.selectbox("Moeda", [m for m in MOEDAS_EXIBICAO if m == "USD" or m in cambio.moedas])
+simbolo = SIMBOLOS[moeda]
+
 # --- Filtragem do DataFrame ---
 # O dataframe principal é filtrado com base nas seleções feitas na barra lateral.
-df_filtrado = df[
-    (df['ano'].isin(anos_selecionados)) &
-    (df['senioridade'].isin(senioridades_selecionadas)) &
-    (df['contrato'].isin(contratos_selecionados)) &
-    (df['tamanho_empresa'].isin(tamanhos_selecionados))
-]
+selecoes = {
+    'ano': anos_selecionados,
+    'senioridade': senioridades_selecionadas,
+    'contrato': contratos_selecionados,
+    'tamanho_empresa': tamanhos_selecionados,
+}
+# KPIs e gráficos saem já agregados do cache por combinação de filtros; as linhas filtradas
+# só são montadas na tabela, uma página por vez
+agregados = obter_agregados(df, indice_filtros, cambio, versao_dados, moeda)
+resumo = agregados.obter(selecoes)
+tem_dados = resumo['total_registros'] > 0
+st.sidebar.caption(f"Cache de agregados: {agregados.acertos} acertos, {agregados.falhas} falhas")
 # --- Conteúdo Principal ---
 st.title("🎲 Dashboard de Análise de Salários na Área de Dados")
 st.markdown("Explore os dados salariais na área de dados nos últimos anos. Utilize os filtros à esquerda para refinar sua análise.")
 
 # --- Métricas Principais (KPIs) ---
-st.subheader("Métricas gerais (Salário anual em USD)")
-
-if not df_filtrado.empty:
-    salario_medio = df_filtrado['usd'].mean()
-    salario_maximo = df_filtrado['usd'].max()
-    total_registros = df_filtrado.shape[0]
-    cargo_mais_frequente = df_filtrado["cargo"].mode()[0]
+st.subheader(f"Métricas gerais (Salário anual em {moeda})")
+
+if tem_dados:
+    salario_medio = resumo['salario_medio']
+    # Mediana e p90 aproximados (erro relativo de até 1%, ver esbocos_salarios.py)
+    salario_mediano = resumo['salario_mediano']
+    salario_p90 = resumo['salario_p90']
+    salario_maximo = resumo['salario_maximo']
+    total_registros = resumo['total_registros']
+    cargo_mais_frequente = resumo['cargo_mais_frequente']
 else:
-    salario_medio, salario_mediano, salario_maximo, total_registros, cargo_mais_comum = 0, 0, 0, ""
-
-col1, col2, col3, col4 = st.columns(4)
-col1.metric("Salário médio", f"${salario_medio:,.0f}")
-col2.metric("Salário máximo", f"${salario_maximo:,.0f}")
-col3.metric("Total de registros", f"{total_registros:,}")
-col4.metric("Cargo mais frequente", cargo_mais_frequente)
+    salario_medio, salario_mediano, salario_p90, salario_maximo, total_registros, cargo_mais_frequente = 0, 0, 0, 0, 0, ""
+
+col1, col2, col3, col4, col5, col6 = st.columns(6)
+col1.metric("Salário médio", f"{simbolo}{salario_medio:,.0f}")
+col2.metric("Salário mediano", f"~{simbolo}{salario_mediano:,.0f}")
+col3.metric("Salário p90", f"~{simbolo}{salario_p90:,.0f}")
+col4.metric("Salário máximo", f"{simbolo}{salario_maximo:,.0f}")
+col5.metric("Total de registros", f"{total_registros:,}")
+col6.metric("Cargo mais frequente", cargo_mais_frequente)
+# Tempo até os KPIs nesta execução (lido pelo relatorio_inicializacao.py)
+st.session_state["ms_ate_kpis"] = (time.perf_counter() - INICIO_SCRIPT) * 1000
 
 st.markdown("---")
 
 # --- Análises Visuais com Plotly ---
-st.subheader("Gráficos")
-
-col_graf1, col_graf2 = st.columns(2)
-
-with col_graf1:
-    if not df_filtrado.empty:
-        top_cargos = df_filtrado.groupby('cargo')['usd'].mean().nlargest(10).sort_values(ascending=True).reset_index()
-        grafico_cargos = px.bar(
-            top_cargos,
-            x='usd',
-            y='cargo',
-            orientation='h',
-            title="Top 10 cargos por salário médio",
-            labels={'usd': 'Média salarial anual (USD)', 'cargo': ''}
-        )
-        grafico_cargos.update_layout(title_x=0.1, yaxis={'categoryorder':'total ascending'})
-        st.plotly_chart(grafico_cargos, use_container_width=True)
-    else:
-        st.warning("Nenhum dado para exibir no gráfico de cargos.")
-
-with col_graf2:
-    if not df_filtrado.empty:
-        grafico_hist = px.histogram(
-            df_filtrado,
-            x='usd',
-            nbins=30,
-            title="Distribuição de salários anuais",
-            labels={'usd': 'Faixa salarial (USD)', 'count': ''}
-        )
-        grafico_hist.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_hist, use_container_width=True)
-    else:
-        st.warning("Nenhum dado para exibir no gráfico de distribuição.")
-
-col_graf3, col_graf4 = st.columns(2)
-
-with col_graf3:
-    if not df_filtrado.empty:
-        remoto_contagem = df_filtrado['remoto'].value_counts().reset_index()
-        remoto_contagem.columns = ['tipo_trabalho', 'quantidade']
-        grafico_remoto = px.pie(
-            remoto_contagem,
-            names='tipo_trabalho',
-            values='quantidade',
-            title='Proporção dos tipos de trabalho',
-            hole=0.5
-        )
-        grafico_remoto.update_traces(textinfo='percent+label')
-        grafico_remoto.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_remoto, use_container_width=True)
-    else:
-        st.warning("Nenhum dado para exibir no gráfico dos tipos de trabalho.")
-
-with col_graf4:
-    if not df_filtrado.empty:
-        df_ds = df_filtrado[df_filtrado['cargo'] == 'Data Scientist']
-        media_ds_pais = df_ds.groupby('residencia_iso3')['usd'].mean().reset_index()
-        grafico_paises = px.choropleth(media_ds_pais,
-            locations='residencia_iso3',
-            color='usd',
-            color_continuous_scale='rdylgn',
-            title='Salário médio de Cientista de Dados por país',
-            labels={'usd': 'Salário médio (USD)', 'residencia_iso3': 'País'})
-        grafico_paises.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_paises, use_container_width=True)
-    else:
-        st.warning("Nenhum dado para exibir no gráfico de países.")
+# Cada seção só é montada quando escolhida; o plotly (import pesado) só é importado quando
+# algum gráfico vai ser desenhado, depois que os KPIs já estão na tela.
+def secao_cargos_e_salarios():
+    import plotly.express as px
+
+    col_graf1, col_graf2 = st.columns(2)
+
+    with col_graf1:
+        if tem_dados:
+            top_cargos = resumo['top_cargos']
+            grafico_cargos = px.bar(
+                top_cargos,
+                x='valor',
+                y='cargo',
+                orientation='h',
+                title="Top 10 cargos por salário médio",
+                labels={'valor': f'Média salarial anual ({moeda})', 'cargo': ''}
+            )
+            grafico_cargos.update_layout(title_x=0.1, yaxis={'categoryorder':'total ascending'})
+            st.plotly_chart(grafico_cargos, use_container_width=True)
+        else:
+            st.warning("Nenhum dado para exibir no gráfico de cargos.")
+
+    with col_graf2:
+        if tem_dados:
+            # Faixas contadas no servidor: o gráfico tem sempre 30 barras, qualquer que seja o tamanho dos dados
+            faixas = resumo['histograma']
+            grafico_hist = px.bar(
+                faixas,
+                x='centro',
+                y='quantidade',
+                custom_data=['inicio', 'fim'],
+                title="Distribuição de salários anuais",
+                labels={'centro': f'Faixa salarial ({moeda})', 'quantidade': ''}
+            )
+            grafico_hist.update_traces(
+                width=faixas['fim'] - faixas['inicio'],
+                hovertemplate=f"{simbolo}%{{customdata[0]:,.0f}} – {simbolo}%{{customdata[1]:,.0f}}<br>%{{y:,}}<extra></extra>",
+            )
+            grafico_hist.update_layout(title_x=0.1, bargap=0)
+            st.plotly_chart(grafico_hist, use_container_width=True)
+        else:
+            st.warning("Nenhum dado para exibir no gráfico de distribuição.")
+
+
+def secao_trabalho_e_paises():
+    import plotly.express as px
+
+    col_graf3, col_graf4 = st.columns(2)
+
+    with col_graf3:
+        if tem_dados:
+            remoto_contagem = resumo['remoto_contagem']
+            grafico_remoto = px.pie(
+                remoto_contagem,
+                names='tipo_trabalho',
+                values='quantidade',
+                title='Proporção dos tipos de trabalho',
+                hole=0.5
+            )
+            grafico_remoto.update_traces(textinfo='percent+label')
+            grafico_remoto.update_layout(title_x=0.1)
+            st.plotly_chart(grafico_remoto, use_container_width=True)
+        else:
+            st.warning("Nenhum dado para exibir no gráfico dos tipos de trabalho.")
+
+    with col_graf4:
+        if tem_dados:
+            media_ds_pais = resumo['media_ds_pais']
+            grafico_paises = px.choropleth(media_ds_pais,
+                locations='residencia_iso3',
+                color='valor',
+                color_continuous_scale='rdylgn',
+                title='Salário médio de Cientista de Dados por país',
+                labels={'valor': f'Salário médio ({moeda})', 'residencia_iso3': 'País'})
+            grafico_paises.update_layout(title_x=0.1)
+            st.plotly_chart(grafico_paises, use_container_width=True)
+        else:
+            st.warning("Nenhum dado para exibir no gráfico de países.")
+
 
 # --- Tabela de Dados Detalhados ---
-st.subheader("Dados Detalhados")
-st.dataframe(df_filtrado)
\ No newline at end of file
+# Só a página visível vai para o navegador; busca, ordenação e paginação rodam no servidor.
+# Em fragmento, trocar de página não refaz os gráficos.
+@st.fragment
+def tabela_detalhada(mascara_filtros):
+    colunas = list(df.columns)
+    col_busca, col_coluna_busca, col_ordenar, col_sentido = st.columns([3, 2, 2, 2])
+    termo = col_busca.text_input("Buscar", placeholder="Texto a procurar")
+    coluna_busca = col_coluna_busca.selectbox("Na coluna", colunas, index=colunas.index('cargo'))
+    coluna_ordem = col_ordenar.selectbox("Ordenar por", ["(sem ordenação)"] + colunas)
+    sentido = col_sentido.radio("Ordem", ["Crescente", "Decrescente"], horizontal=True)
+
+    mascara = mascara_filtros
+    if termo:
+        mascara = mascara & tabela.buscar(coluna_busca, termo)
+    posicoes = tabela.posicoes(
+        mascara,
+        None if coluna_ordem == "(sem ordenação)" else coluna_ordem,
+        ascendente=sentido == "Crescente",
+    )
+
+    col_pagina, col_tamanho, col_total = st.columns([2, 2, 4])
+    tamanho = col_tamanho.selectbox("Linhas por página", LINHAS_POR_PAGINA)
+    paginas = total_paginas(len(posicoes), tamanho)
+    pagina = col_pagina.number_input("Página", min_value=1, max_value=paginas, value=1)
+    col_total.caption(f"{len(posicoes):,} linhas · página {pagina} de {paginas}")
+
+    st.dataframe(tabela.pagina(posicoes, pagina, tamanho), use_container_width=True)
+
+    # O arquivo só é gerado quando alguém clica (o callable roda fora do rerun)
+    col_csv, col_parquet = st.columns(2)
+    col_csv.download_button(
+        "Exportar todas as linhas (CSV)",
+        data=lambda: tabela.exportar(posicoes, "csv"),
+        file_name="salarios.csv",
+        mime="text/csv",
+    )
+    col_parquet.download_button(
+        "Exportar todas as linhas (Parquet)",
+        data=lambda: tabela.exportar(posicoes, "parquet"),
+        file_name="salarios.parquet",
+        mime="application/octet-stream",
+    )
+
+
+def secao_dados_detalhados():
+    tabela_detalhada(indice_filtros.mascara(selecoes))
+
+
+SECOES = {
+    "Cargos e salários": secao_cargos_e_salarios,
+    "Trabalho e países": secao_trabalho_e_paises,
+    "Dados detalhados": secao_dados_detalhados,
+}
+secao_escolhida = st.radio("Seção", list(SECOES), horizontal=True, label_visibility="collapsed")
+st.subheader(secao_escolhida)
+SECOES[secao_escolhida]()
@@ -0,0 +1,92 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# --- AGREGAÇÃO EM PARALELO SOBRE OS SALÁRIOS PARTICIONADOS POR ANO ---
+# Lê a pasta gerada pelo etl_salarios.py (ano=2024/parte-00000.parquet, ...) e distribui o
+# trabalho num pool de processos: cada processo lê só as colunas necessárias de um arquivo,
+# aplica os filtros na leitura (filters do pyarrow) e devolve somas, contagens, mínimos e
+# máximos por grupo. Os parciais pequenos são juntados no fim e a média sai de soma / contagem.
+# Anos fora do filtro nem são abertos (a partição é pulada pelo nome da pasta).
+# Uso: python agregacao_paralela.py salarios_particionado --por senioridade --anos 2024 2025
+
+AGREGACOES = ["sum", "count", "min", "max"]
+
+
+def particoes(pasta, anos=None):
+    # {ano: [arquivos]} das partições ano=AAAA, já sem os anos que o filtro exclui
+    resultado = {}
+    for diretorio in sorted(Path(pasta).glob("ano=*")):
+        ano = int(diretorio.name.split("=", 1)[1])
+        if anos is None or ano in anos:
+            resultado[ano] = sorted(diretorio.glob("*.parquet"))
+    return resultado
+
+
+def _agregar_arquivo(arquivo, ano, por, filtros, valor):
+    # Roda em outro processo: parciais de um arquivo de uma partição
+    colunas = [c for c in dict.fromkeys(list(por) + list(filtros) + [valor]) if c != "ano"]
+    condicoes = [(coluna, "in", list(valores)) for coluna, valores in filtros.items() if coluna != "ano"]
+    df = pd.read_parquet(arquivo, columns=colunas, filters=condicoes or None)
+    if "ano" in por:
+        df["ano"] = ano
+    parcial = df.groupby(list(por), observed=True)[valor].agg(AGREGACOES).reset_index()
+    # Cada arquivo tem as próprias categorias: os grupos voltam a ser valores simples antes de juntar
+    for coluna in por:
+        if isinstance(parcial[coluna].dtype, pd.CategoricalDtype):
+            parcial[coluna] = parcial[coluna].astype(object)
+    return parcial.set_index(list(por))
+
+
+def _juntar(parciais):
+    if not parciais:
+        return pd.DataFrame(columns=AGREGACOES)
+    juntos = pd.concat(parciais)
+    grupos = juntos.groupby(level=list(range(juntos.index.nlevels)), observed=True)
+    return grupos.agg({"sum": "sum", "count": "sum", "min": "min", "max": "max"})
+
+
+def agregar(pasta, por, anos=None, filtros=None, valor="usd", processos=None):
+    # por: colunas do agrupamento; anos: anos a incluir (None = todos)
+    # filtros: {coluna: valores aceitos} das demais colunas
+    # Devolve um DataFrame com soma, contagem, mínimo, máximo e média por grupo
+    por = [por] if isinstance(por, str) else list(por)
+    filtros = dict(filtros or {})
+    if "ano" in filtros:
+        # Filtro de ano vira escolha de partições
+        anos = [ano for ano in filtros.pop("ano") if anos is None or ano in anos]
+    tarefas = [(arquivo, ano) for ano, arquivos in particoes(pasta, anos).items() for arquivo in arquivos]
+
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(tarefas) <= 1:
+        parciais = [_agregar_arquivo(arquivo, ano, por, filtros, valor) for arquivo, ano in tarefas]
+    else:
+        with ProcessPoolExecutor(min(processos, len(tarefas))) as pool:
+            futuros = [pool.submit(_agregar_arquivo, arquivo, ano, por, filtros, valor) for arquivo, ano in tarefas]
+            parciais = [futuro.result() for futuro in futuros]
+
+    resultado = _juntar(parciais)
+    resultado["media"] = resultado["sum"] / resultado["count"]
+    return resultado.sort_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Média, contagem, mínimo e máximo de usd por grupo, em paralelo.")
+    parser.add_argument("pasta", help="pasta particionada gerada pelo etl_salarios.py")
+    parser.add_argument("--por", nargs="+", default=["senioridade"], help="colunas do agrupamento")
+    parser.add_argument("--anos", nargs="+", type=int, help="anos a incluir (padrão: todos)")
+    parser.add_argument("--processos", type=int, help="tamanho do pool (padrão: número de núcleos)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultado = agregar(args.pasta, args.por, anos=args.anos, processos=args.processos)
+    print(resultado.to_string())
+    print(f"\n{time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
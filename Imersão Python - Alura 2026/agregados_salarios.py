@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from esbocos_salarios import EsbocosSalarios
+
+# --- AGREGADOS DO A04 COM CACHE POR COMBINAÇÃO DE FILTROS ---
+# Os KPIs e os gráficos (top cargos, tipos de trabalho, mapa) eram recalculados do zero a
+# cada rerun, cada um varrendo o df_filtrado de novo. Aqui, uma vez por versão dos dados,
+# agrupamos as linhas pelas colunas de filtro + a coluna de cada gráfico, guardando somas,
+# contagens e máximos (parciais). Para uma combinação de filtros basta juntar as poucas
+# linhas de parciais que batem com a seleção, sem olhar o DataFrame inteiro.
+# Mediana, p90 e cargo mais frequente vêm dos esboços por partição (esbocos_salarios.py),
+# com os limites de erro descritos lá.
+# O histograma de salários também sai pronto: as contagens das BINS_HISTOGRAMA faixas são
+# feitas aqui com np.histogram e o gráfico recebe só essas faixas, não os salários linha a linha.
+# Os resultados ficam num cache LRU (LIMITE_CACHE combinações) com contadores de acertos e
+# falhas; como o objeto é recriado junto com os dados, o cache vale só para aquela versão.
+
+LIMITE_CACHE = 64
+CARGO_MAPA = "Data Scientist"
+BINS_HISTOGRAMA = 30
+
+
+def chave_filtro(selecoes, opcoes):
+    # Mesma chave para a mesma seleção, independente da ordem dos cliques;
+    # coluna com todas as opções marcadas vira "todos"
+    chave = []
+    for coluna in sorted(selecoes):
+        marcados = set(selecoes[coluna])
+        if marcados >= set(opcoes[coluna]):
+            chave.append((coluna, "todos"))
+        else:
+            chave.append((coluna, tuple(sorted(marcados))))
+    return tuple(chave)
+
+
+def histograma(valores, bins=BINS_HISTOGRAMA):
+    # Faixas de mesma largura entre o menor e o maior valor, como o nbins do px.histogram
+    valores = valores[~np.isnan(valores)]
+    quantidade, bordas = np.histogram(valores, bins=bins)
+    return pd.DataFrame({
+        "inicio": bordas[:-1],
+        "fim": bordas[1:],
+        "centro": (bordas[:-1] + bordas[1:]) / 2,
+        "quantidade": quantidade,
+    })
+
+
+def _parciais(df, chaves, coluna, valor, agregacoes):
+    # dropna=False: linhas com cargo/remoto/país vazio ainda contam nos totais gerais
+    return df.groupby(chaves + [coluna], observed=True, dropna=False)[valor].agg(agregacoes).reset_index()
+
+
+class AgregadosSalarios:
+    def __init__(self, df, indice, esbocos=None, coluna_valor="usd", limite=LIMITE_CACHE):
+        # indice: IndiceFiltros dos mesmos dados (opções e máscara de cada seleção)
+        # esbocos: EsbocosSalarios já montados (por exemplo lidos em blocos); se não vier, monta do df
+        # coluna_valor: coluna somada (usd, ou o salário convertido para outra moeda)
+        self.indice = indice
+        self.opcoes = indice.opcoes
+        self.colunas_filtro = list(indice.opcoes)
+        self.limite = limite
+
+        chaves = self.colunas_filtro
+        self.por_cargo = _parciais(df, chaves, "cargo", coluna_valor, ["sum", "count", "max", "size"])
+        self.por_remoto = _parciais(df, chaves, "remoto", coluna_valor, ["size"])
+        self.mapa_por_pais = _parciais(
+            df[df["cargo"] == CARGO_MAPA], chaves, "residencia_iso3", coluna_valor, ["sum", "count"]
+        )
+        self.esbocos = esbocos or EsbocosSalarios.de_dataframe(
+            df, colunas=self.colunas_filtro, coluna_valor=coluna_valor
+        )
+        self.valores = df[coluna_valor].to_numpy(dtype="float64", na_value=np.nan)
+
+        self._cache = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def _recortar(self, parciais, selecoes):
+        # Mesmo critério do isin: valores vazios nas colunas de filtro nunca entram
+        mascara = np.ones(len(parciais), dtype=bool)
+        for coluna, marcados in selecoes.items():
+            mascara &= parciais[coluna].isin(list(marcados)).to_numpy()
+        return parciais[mascara]
+
+    def _calcular(self, selecoes):
+        por_cargo = self._recortar(self.por_cargo, selecoes)
+        total_registros = int(por_cargo["size"].sum())
+        if total_registros == 0:
+            return {"total_registros": 0}
+
+        cargos = por_cargo.groupby("cargo", observed=True)[["sum", "count"]].sum()
+        media_cargo = cargos["sum"] / cargos["count"].replace(0, np.nan)
+        top_cargos = media_cargo.nlargest(10).sort_values(ascending=True).rename("valor").reset_index()
+
+        remoto = self._recortar(self.por_remoto, selecoes).groupby("remoto", observed=True)["size"].sum()
+        remoto_contagem = remoto[remoto > 0].sort_values(ascending=False, kind="stable").reset_index()
+        remoto_contagem.columns = ["tipo_trabalho", "quantidade"]
+
+        paises = self._recortar(self.mapa_por_pais, selecoes).groupby("residencia_iso3", observed=True)[["sum", "count"]].sum()
+        media_pais = (paises["sum"] / paises["count"].replace(0, np.nan)).dropna()
+
+        salario_mediano, salario_p90 = self.esbocos.quantis(selecoes, (0.5, 0.9))
+        frequentes, erro_cargo = self.esbocos.mais_frequentes(selecoes)
+
+        return {
+            "total_registros": total_registros,
+            "salario_medio": por_cargo["sum"].sum() / por_cargo["count"].sum(),
+            "salario_mediano": salario_mediano,
+            "salario_p90": salario_p90,
+            "salario_maximo": por_cargo["max"].max(),
+            "cargo_mais_frequente": frequentes[0][0] if frequentes else "",
+            "erro_cargo": erro_cargo,
+            "top_cargos": top_cargos,
+            "remoto_contagem": remoto_contagem,
+            "media_ds_pais": media_pais.rename("valor").reset_index(),
+            "histograma": histograma(self.valores[self.indice.mascara(selecoes)]),
+        }
+
+    def obter(self, selecoes):
+        chave = chave_filtro(selecoes, self.opcoes)
+        with self._trava:
+            if chave in self._cache:
+                self._cache.move_to_end(chave)
+                self.acertos += 1
+                return self._cache[chave]
+            self.falhas += 1
+
+        resultado = self._calcular(selecoes)
+        with self._trava:
+            self._cache[chave] = resultado
+            while len(self._cache) > self.limite:
+                self._cache.popitem(last=False)
+        return resultado
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# --- BENCHMARK DOS RERUNS DO A04 ---
+# Roda o A04 sem navegador (AppTest do Streamlit) sobre CSVs sintéticos de vários tamanhos
+# (salarios_sinteticos.py) e, em cada seção, troca os quatro multiselects da sidebar
+# (ano, senioridade, contrato, tamanho da empresa) para subconjuntos sorteados. Para cada
+# tamanho e seção mede:
+#   - p50 e p95 do tempo de rerun depois de cada troca de filtro;
+#   - bytes enviados ao navegador: o JSON de cada figura do plotly e o Arrow da tabela;
+# e, para o tamanho todo, o pico de memória do processo (ru_maxrss).
+# Cada tamanho roda num Python novo, para o pico de memória e os caches não misturarem.
+# Uso: python benchmark_a04.py --linhas 10000 1000000 10000000 --saida resultado.json
+#      python benchmark_a04.py --linhas 10000 --comparar resultado.json   (diferença de p95)
+
+PASTA = Path(__file__).parent
+TAMANHOS = [10_000, 1_000_000, 10_000_000]
+FILTROS = ["Ano", "Senioridade", "Tipo de Contrato", "Tamanho da Empresa"]
+
+
+def percentil(valores, p):
+    return float(np.percentile(valores, p)) if valores else 0.0
+
+
+def _bytes_tabela(proto):
+    # O Arrow do st.dataframe mudou de lugar entre versões do Streamlit: arrow_data.data nas
+    # recentes, lazy_data.initial_chunk.data nas que mandam a tabela aos poucos, data nas antigas
+    for caminho in (("arrow_data", "data"), ("lazy_data", "initial_chunk", "data"), ("data",)):
+        valor = proto
+        for campo in caminho:
+            valor = getattr(valor, campo, None)
+            if valor is None:
+                break
+        if valor:
+            return len(valor)
+    return 0
+
+
+def bytes_enviados(app):
+    # Figuras: o JSON (spec) de cada st.plotly_chart; tabela: o Arrow de cada st.dataframe
+    # (versões antigas do Streamlit guardam o JSON em figure.spec)
+    figuras = sum(
+        len(getattr(elemento.proto, "spec", "") or elemento.proto.figure.spec) for elemento in app.get("plotly_chart")
+    )
+    tabelas = sum(_bytes_tabela(elemento.proto) for elemento in app.dataframe)
+    return figuras + tabelas
+
+
+def pico_memoria_mb():
+    # No Linux o ru_maxrss vem em KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir_tamanho(linhas, reruns, semente):
+    # Roda dentro do Python filho: gera o CSV, sobe o A04 e percorre seções x filtros
+    temporaria = Path(tempfile.mkdtemp(prefix=f"benchmark_a04_{linhas}_"))
+    # Precisam estar definidos antes de o A04 importar dados_salarios (as taxas de câmbio
+    # derivadas também vão para essa pasta de cache)
+    os.environ["SALARIOS_CSV"] = str(temporaria / "salarios.csv")
+    os.environ["SALARIOS_CACHE"] = str(temporaria / "cache")
+
+    sys.path.insert(0, str(PASTA))
+    from salarios_sinteticos import salvar_csv
+    from streamlit.testing.v1 import AppTest
+
+    inicio = time.perf_counter()
+    salvar_csv(os.environ["SALARIOS_CSV"], linhas, semente=semente)
+    geracao = (time.perf_counter() - inicio) * 1000
+
+    app = AppTest.from_file(str(PASTA / "A04_Imersão_Python.py"), default_timeout=1800)
+    inicio = time.perf_counter()
+    app.run()
+    primeira = (time.perf_counter() - inicio) * 1000
+    if app.exception:
+        raise RuntimeError(f"O A04 terminou com erro: {[e.value for e in app.exception]}")
+
+    # Com default=todas as opções, o valor inicial de cada multiselect é a lista completa
+    opcoes = {nome: list(app.multiselect[i].value) for i, nome in enumerate(FILTROS)}
+    rng = np.random.default_rng(semente)
+
+    secoes = {}
+    for secao in app.radio[0].options:
+        app.radio[0].set_value(secao)
+        app.run()
+        tempos, enviados = [], []
+        for _ in range(reruns):
+            for i, nome in enumerate(FILTROS):
+                # Subconjunto sorteado (nunca vazio) de um filtro por vez, como um usuário faria
+                todas = opcoes[nome]
+                quantas = int(rng.integers(1, len(todas) + 1))
+                escolhidas = [todas[j] for j in sorted(rng.choice(len(todas), quantas, replace=False))]
+                app.multiselect[i].set_value(escolhidas)
+                inicio = time.perf_counter()
+                app.run()
+                tempos.append((time.perf_counter() - inicio) * 1000)
+                if app.exception:
+                    raise RuntimeError(f"Erro no rerun ({secao}, {nome}): {[e.value for e in app.exception]}")
+                enviados.append(bytes_enviados(app))
+        # Volta todos os filtros para "tudo" antes da próxima seção
+        for i, nome in enumerate(FILTROS):
+            app.multiselect[i].set_value(opcoes[nome])
+        secoes[secao] = {
+            "reruns": len(tempos),
+            "p50_ms": percentil(tempos, 50),
+            "p95_ms": percentil(tempos, 95),
+            "bytes_medio": float(np.mean(enviados)) if enviados else 0.0,
+            "bytes_max": max(enviados, default=0),
+        }
+
+    return {
+        "linhas": linhas,
+        "geracao_csv_ms": geracao,
+        "primeira_execucao_ms": primeira,
+        "pico_memoria_mb": pico_memoria_mb(),
+        "secoes": secoes,
+    }
+
+
+def rodar_em_processo_novo(linhas, reruns, semente):
+    comando = [sys.executable, str(Path(__file__).resolve()), "--filho", str(linhas),
+               "--reruns", str(reruns), "--semente", str(semente)]
+    saida = subprocess.run(comando, cwd=PASTA, capture_output=True, text=True)
+    if saida.returncode != 0:
+        raise RuntimeError(f"Falhou com {linhas:,} linhas:\n{saida.stderr[-2000:]}")
+    # O resultado é a última linha da saída; o resto é log do Streamlit
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def comparar(resultado, anterior):
+    # p95 de cada (tamanho, seção) presente nos dois arquivos
+    antes = {(t["linhas"], s): v["p95_ms"] for t in anterior["tamanhos"] for s, v in t["secoes"].items()}
+    print(f"\n{'Comparação de p95':<40}{'antes':>10}{'agora':>10}{'variação':>10}")
+    for tamanho in resultado["tamanhos"]:
+        for secao, valores in tamanho["secoes"].items():
+            chave = (tamanho["linhas"], secao)
+            if chave in antes:
+                variacao = (valores["p95_ms"] / antes[chave] - 1) * 100 if antes[chave] else 0.0
+                print(f"{tamanho['linhas']:>10,} {secao:<29}{antes[chave]:>10.1f}{valores['p95_ms']:>10.1f}"
+                      f"{variacao:>+9.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência dos reruns, memória e bytes enviados pelo A04.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=TAMANHOS, help="tamanhos dos dados sintéticos")
+    parser.add_argument("--reruns", type=int, default=5, help="rodadas de troca dos quatro filtros por seção")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", help="arquivo JSON com o resultado")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar o p95")
+    parser.add_argument("--filho", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho is not None:
+        print(json.dumps(medir_tamanho(args.filho, args.reruns, args.semente), ensure_ascii=False))
+        return
+
+    resultado = {"parametros": {"reruns": args.reruns, "semente": args.semente}, "em": time.time(), "tamanhos": []}
+    for linhas in args.linhas:
+        print(f"Medindo {linhas:,} linhas...", flush=True)
+        resultado["tamanhos"].append(rodar_em_processo_novo(linhas, args.reruns, args.semente))
+
+    for tamanho in resultado["tamanhos"]:
+        print(f"\n{tamanho['linhas']:,} linhas: primeira execução {tamanho['primeira_execucao_ms']:,.0f} ms, "
+              f"pico de memória {tamanho['pico_memoria_mb']:,.0f} MB")
+        print(f"{'Seção':<22}{'p50 (ms)':>10}{'p95 (ms)':>10}{'KB médio':>10}{'KB máx':>10}")
+        for secao, valores in tamanho["secoes"].items():
+            print(f"{secao:<22}{valores['p50_ms']:>10.1f}{valores['p95_ms']:>10.1f}"
+                  f"{valores['bytes_medio'] / 1024:>10.1f}{valores['bytes_max'] / 1024:>10.1f}")
+
+    if args.comparar:
+        comparar(resultado, json.loads(Path(args.comparar).read_text(encoding="utf-8")))
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dados_salarios import PASTA_CACHE
+
+# --- CONVERSÃO DE MOEDA DOS SALÁRIOS ---
+# Os dados trazem o salário na moeda local (salario + moeda) e já convertido (usd). Para mostrar
+# em BRL ou EUR usamos uma tabela de câmbio por (ano, moeda) com quantos dólares vale 1 unidade
+# da moeda. A conversão é uma busca numa matriz [ano x moeda] pelos códigos das categorias e
+# uma multiplicação, sem laço por linha:
+#     valor_destino = salario * usd_por_unidade[ano, moeda] / usd_por_unidade[ano, destino]
+# Quem recebe na moeda de destino fica com o salário original (o fator é exatamente 1).
+# Sem SALARIOS_TAXAS, a tabela é calculada dos próprios dados (soma de usd / soma de salario em
+# cada ano e moeda) a cada versão dos dados, e gravada em .cache/taxas_cambio.csv só para
+# consulta: um ano ou uma moeda nova nos dados entra na tabela na próxima carga.
+# Com SALARIOS_TAXAS=<arquivo.csv> (ano, moeda, usd_por_unidade) a tabela é a do arquivo, por
+# exemplo com taxas oficiais; se o arquivo ainda não existe, ele é criado com as taxas derivadas.
+# Anos sem lançamentos numa moeda, e anos fora da tabela, usam a taxa do ano mais próximo
+# (no empate, o anterior).
+
+CAMINHO_TAXAS = os.environ.get("SALARIOS_TAXAS")
+CAMINHO_TAXAS_DERIVADAS = PASTA_CACHE / "taxas_cambio.csv"
+MOEDAS_EXIBICAO = ["USD", "BRL", "EUR"]
+SIMBOLOS = {"USD": "$", "BRL": "R$ ", "EUR": "€"}
+
+
+def ano_mais_proximo(anos_tabela, anos):
+    # Posição em anos_tabela (ordenado) do ano mais próximo de cada ano; no empate, o anterior
+    anos_tabela, anos = np.asarray(anos_tabela), np.asarray(anos)
+    depois = np.clip(np.searchsorted(anos_tabela, anos), 0, len(anos_tabela) - 1)
+    antes = np.clip(depois - 1, 0, len(anos_tabela) - 1)
+    return np.where(np.abs(anos - anos_tabela[antes]) <= np.abs(anos_tabela[depois] - anos), antes, depois)
+
+
+def derivar_taxas(df):
+    # Taxa implícita nos dados: quantos dólares cada unidade da moeda valeu naquele ano
+    somas = df.groupby(["ano", "moeda"], observed=True)[["usd", "salario"]].sum()
+    somas = somas[somas["salario"] > 0]
+    return (somas["usd"] / somas["salario"]).rename("usd_por_unidade").reset_index()
+
+
+class TabelaCambio:
+    def __init__(self, taxas):
+        # taxas: DataFrame com ano, moeda e usd_por_unidade
+        matriz = taxas.pivot_table(index="ano", columns="moeda", values="usd_por_unidade", observed=True)
+        matriz = matriz.sort_index()
+        self.anos = matriz.index.to_numpy()
+        self.moedas = [str(moeda) for moeda in matriz.columns]
+        self.matriz = matriz.to_numpy(dtype="float64")
+        # Preenche os buracos de cada moeda com a taxa do ano mais próximo que tem taxa
+        for coluna in range(self.matriz.shape[1]):
+            taxas_moeda = self.matriz[:, coluna]
+            com_taxa = ~np.isnan(taxas_moeda)
+            if com_taxa.any() and not com_taxa.all():
+                proximo = ano_mais_proximo(self.anos[com_taxa], self.anos)
+                self.matriz[:, coluna] = taxas_moeda[com_taxa][proximo]
+
+    @classmethod
+    def carregar(cls, df, caminho=CAMINHO_TAXAS):
+        # Chamado uma vez por versão dos dados (no carregar_dados do A04)
+        if caminho and Path(caminho).exists():
+            return cls(pd.read_csv(caminho))
+        taxas = derivar_taxas(df)
+        destino = Path(caminho) if caminho else CAMINHO_TAXAS_DERIVADAS
+        texto = taxas.to_csv(index=False)
+        try:
+            # Só grava quando as taxas mudaram
+            if not destino.exists() or destino.read_text(encoding="utf-8") != texto:
+                destino.parent.mkdir(parents=True, exist_ok=True)
+                destino.write_text(texto, encoding="utf-8")
+        except OSError:
+            # Disco somente leitura ou sem espaço: o arquivo é só uma cópia, a tabela em memória basta
+            pass
+        return cls(taxas)
+
+    def _linhas(self, anos):
+        # Índice do ano na matriz; anos fora da tabela usam o mais próximo
+        return ano_mais_proximo(self.anos, anos)
+
+    def converter(self, df, destino):
+        if destino not in self.moedas:
+            raise ValueError(f"Sem taxa de câmbio para {destino}; moedas na tabela: {', '.join(self.moedas)}")
+        linhas = self._linhas(df["ano"].to_numpy())
+        # Códigos das moedas na ordem das colunas da matriz (-1 = moeda sem taxa). A troca é feita
+        # nas categorias (poucas) e levada às linhas pelos códigos
+        moeda = df["moeda"]
+        if not isinstance(moeda.dtype, pd.CategoricalDtype):
+            moeda = moeda.astype("category")
+        posicao = pd.Index(self.moedas).get_indexer(moeda.cat.categories.astype(str))
+        codigos = np.append(posicao, -1)[moeda.cat.codes.to_numpy()]
+        fator = self.matriz[linhas, codigos] / self.matriz[linhas, self.moedas.index(destino)]
+        fator[codigos < 0] = np.nan
+        return df["salario"].to_numpy(dtype="float64", na_value=np.nan) * fator
@@ -0,0 +1,160 @@
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+
+# --- CARREGAMENTO DOS DADOS DE SALÁRIOS COM CACHE EM DISCO ---
+# O CSV do GitHub era baixado e lido de novo a cada rerun do Streamlit. Agora ele fica salvo
+# em .cache/salarios.parquet, já com os tipos certos (ano inteiro, textos como category).
+# A cada REVALIDAR_A_CADA segundos perguntamos ao servidor se o arquivo mudou (ETag /
+# Last-Modified): se não mudou (304), nada é baixado. Sem rede, o cache salvo continua valendo.
+# Variáveis de ambiente:
+#   SALARIOS_CSV=<arquivo>  usa um CSV local em vez da URL (modo offline)
+#   SALARIOS_PARQUET=<pasta> usa a saída particionada do etl_salarios.py
+#   SALARIOS_OFFLINE=1      nunca acessa a rede, só o cache em disco
+#   SALARIOS_CACHE=<pasta>  pasta do cache (padrão: .cache ao lado deste arquivo)
+
+URL_DADOS = "https://raw.githubusercontent.com/vqrca/dashboard_salarios_dados/refs/heads/main/dados-imersao-final.csv"
+REVALIDAR_A_CADA = 6 * 60 * 60
+TEMPO_LIMITE = 30
+
+PASTA_CACHE = Path(os.environ.get("SALARIOS_CACHE", Path(__file__).parent / ".cache"))
+
+COLUNAS_INTEIRAS = ["ano", "salario", "usd"]
+COLUNAS_CATEGORICAS = [
+    "senioridade", "contrato", "cargo", "moeda", "residencia",
+    "remoto", "empresa", "tamanho_empresa", "residencia_iso3",
+]
+
+
+def tipar(df):
+    # Inteiros no menor tipo que cabe e textos repetidos como category (categorias em ordem
+    # alfabética, que é a ordem das opções nos filtros)
+    for coluna in COLUNAS_INTEIRAS:
+        if coluna in df.columns:
+            valores = pd.to_numeric(df[coluna], errors="coerce")
+            if valores.isna().any():
+                df[coluna] = valores.astype("Int64")
+            else:
+                df[coluna] = pd.to_numeric(valores.astype("int64"), downcast="integer")
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns:
+            serie = df[coluna].astype("category")
+            df[coluna] = serie.cat.reorder_categories(sorted(serie.cat.categories, key=str))
+    return df
+
+
+def ler_csv(origem):
+    # origem: caminho local ou arquivo aberto (resposta HTTP)
+    return tipar(pd.read_csv(origem))
+
+
+def _escrever_atomico(caminho, escrever):
+    # Escreve num arquivo temporário e troca de uma vez, para nunca deixar um cache pela metade
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+
+class CacheSalarios:
+    def __init__(self, pasta=PASTA_CACHE, nome="salarios"):
+        self.caminho = Path(pasta) / f"{nome}.parquet"
+        self.caminho_meta = Path(pasta) / f"{nome}.json"
+
+    def meta(self):
+        if not (self.caminho.exists() and self.caminho_meta.exists()):
+            return None
+        try:
+            return json.loads(self.caminho_meta.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+    def ler(self):
+        return pd.read_parquet(self.caminho)
+
+    def salvar(self, df, meta):
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        _escrever_atomico(self.caminho, lambda destino: df.to_parquet(destino, index=False))
+        self.salvar_meta(meta)
+
+    def salvar_meta(self, meta):
+        _escrever_atomico(
+            self.caminho_meta,
+            lambda destino: destino.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8"),
+        )
+
+
+def carregar_arquivo_local(caminho, cache=None):
+    # Modo offline: o Parquet é refeito só quando o CSV muda (tamanho ou data de modificação)
+    cache = cache or CacheSalarios()
+    caminho = Path(caminho)
+    info = caminho.stat()
+    origem = {"arquivo": str(caminho.resolve()), "tamanho": info.st_size, "modificado_ns": info.st_mtime_ns}
+
+    meta = cache.meta()
+    if meta and meta.get("origem") == origem:
+        return cache.ler()
+
+    df = ler_csv(caminho)
+    cache.salvar(df, {"origem": origem, "verificado_em": time.time()})
+    return df
+
+
+def carregar_particionado(pasta):
+    # Pasta gerada pelo etl_salarios.py (ano=2024/parte-00000.parquet, ...); já vem tipada,
+    # só o ano, que vem do nome da pasta, precisa voltar a ser inteiro
+    df = pd.read_parquet(pasta)
+    df["ano"] = df["ano"].astype("int64")
+    return tipar(df[["ano"] + [c for c in df.columns if c != "ano"]])
+
+
+def carregar_url(url=URL_DADOS, cache=None, revalidar_a_cada=REVALIDAR_A_CADA, offline=False):
+    cache = cache or CacheSalarios()
+    meta = cache.meta()
+    if meta and meta.get("origem") != url:
+        meta = None
+
+    if meta and (offline or time.time() - meta["verificado_em"] < revalidar_a_cada):
+        return cache.ler()
+    if offline:
+        raise FileNotFoundError(f"Sem cache em {cache.caminho} e SALARIOS_OFFLINE=1")
+
+    # Requisição condicional: o servidor responde 304 se o arquivo não mudou
+    cabecalhos = {}
+    if meta and meta.get("etag"):
+        cabecalhos["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        cabecalhos["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=cabecalhos), timeout=TEMPO_LIMITE) as resposta:
+            df = ler_csv(resposta)
+            etag, last_modified = resposta.headers.get("ETag"), resposta.headers.get("Last-Modified")
+    except urllib.error.HTTPError as erro:
+        if erro.code == 304 and meta:
+            cache.salvar_meta({**meta, "verificado_em": time.time()})
+            return cache.ler()
+        if not meta:
+            raise
+        return cache.ler()
+    except urllib.error.URLError:
+        # Sem rede: segue com o cache antigo, se houver
+        if not meta:
+            raise
+        return cache.ler()
+
+    cache.salvar(df, {"origem": url, "etag": etag, "last_modified": last_modified, "verificado_em": time.time()})
+    return df
+
+
+def carregar_salarios():
+    # Ponto de entrada usado pelo dashboard (A04)
+    if os.environ.get("SALARIOS_PARQUET"):
+        return carregar_particionado(os.environ["SALARIOS_PARQUET"])
+    if os.environ.get("SALARIOS_CSV"):
+        return carregar_arquivo_local(os.environ["SALARIOS_CSV"])
+    return carregar_url(offline=os.environ.get("SALARIOS_OFFLINE") == "1")
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from filtros_salarios import COLUNAS_FILTRO
+
+# --- ESBOÇOS (SKETCHES) PARA OS KPIs DE SALÁRIO ---
+# Mediana, p90 e cargo mais frequente sem ordenar nem contar as linhas a cada rerun.
+# Os dados são divididos em partições (uma por combinação das colunas de filtro) e cada
+# partição guarda dois resumos pequenos que podem ser somados entre si:
+#   - quantis do salário (usd ou outra coluna de valor) num histograma logarítmico (mesma
+#     ideia do DDSketch): o valor x cai no balde ceil(log(x) / log(gama)), com
+#     gama = (1 + ALFA) / (1 - ALFA). Qualquer quantil
+#     devolvido tem erro relativo de no máximo ALFA (1%: uma mediana de 100.000 sai entre
+#     99.000 e 101.000), não importa quantas partições foram juntadas;
+#   - contadores de Misra-Gries para o cargo (no máximo K_CARGOS por partição). A contagem de
+#     cada cargo fica subestimada em no máximo N / (K_CARGOS + 1), N = linhas somadas; se a
+#     partição tem até K_CARGOS cargos distintos a contagem é exata.
+# Os resumos são montados em blocos (adicionar), então também dá para construí-los lendo um
+# CSV maior que a memória (de_csv); juntar partições é somar tabelas pequenas.
+
+ALFA = 0.01
+K_CARGOS = 100
+TAMANHO_BLOCO = 250_000
+
+
+class EsbocosSalarios:
+    def __init__(self, colunas=COLUNAS_FILTRO, alfa=ALFA, k=K_CARGOS, coluna_valor="usd"):
+        self.colunas = list(colunas)
+        self.coluna_valor = coluna_valor
+        self.alfa = alfa
+        self.k = k
+        self.log_gama = np.log((1 + alfa) / (1 - alfa))
+        # partição + balde -> quantidade
+        self.baldes = None
+        # partição + cargo -> contador; partição -> linhas vistas (para o limite de erro)
+        self.cargos = None
+        self.linhas = None
+
+    @classmethod
+    def de_dataframe(cls, df, tamanho_bloco=TAMANHO_BLOCO, **kwargs):
+        esbocos = cls(**kwargs)
+        for inicio in range(0, len(df), tamanho_bloco):
+            esbocos.adicionar(df.iloc[inicio:inicio + tamanho_bloco])
+        return esbocos
+
+    @classmethod
+    def de_csv(cls, caminho, tamanho_bloco=TAMANHO_BLOCO, **kwargs):
+        # Lê o CSV em blocos: a memória usada é a de um bloco mais os resumos
+        esbocos = cls(**kwargs)
+        for bloco in pd.read_csv(caminho, chunksize=tamanho_bloco):
+            esbocos.adicionar(bloco)
+        return esbocos
+
+    def _balde(self, valores):
+        # Valores <= 0 vão todos para um balde especial (o menor possível)
+        valores = np.asarray(valores, dtype="float64")
+        baldes = np.full(len(valores), np.iinfo("int32").min, dtype="int64")
+        positivos = valores > 0
+        baldes[positivos] = np.ceil(np.log(valores[positivos]) / self.log_gama)
+        return baldes
+
+    def _valor(self, baldes):
+        # Ponto do balde com erro relativo <= alfa para qualquer valor dentro dele
+        gama = np.exp(self.log_gama)
+        valores = 2 * gama ** baldes.astype("float64") / (gama + 1)
+        return np.where(baldes == np.iinfo("int32").min, 0.0, valores)
+
+    def _podar(self, cargos):
+        # Misra-Gries: em cada partição fica no máximo k cargos; todos perdem a (k+1)-ésima contagem
+        cargos = cargos.sort_values(self.colunas + ["contador"], ascending=[True] * len(self.colunas) + [False])
+        posicao = cargos.groupby(self.colunas, observed=True, dropna=False).cumcount()
+        corte = cargos["contador"].where(posicao == self.k)
+        corte = corte.groupby([cargos[c] for c in self.colunas], observed=True, dropna=False).transform("max").fillna(0)
+        cargos = cargos.assign(contador=cargos["contador"] - corte)
+        return cargos[(posicao < self.k) & (cargos["contador"] > 0)].reset_index(drop=True)
+
+    def adicionar(self, df):
+        bloco = df[self.colunas].copy()
+        valores = pd.to_numeric(df[self.coluna_valor], errors="coerce")
+        bloco["balde"] = self._balde(valores.fillna(0))
+
+        baldes = bloco[valores.notna().to_numpy()].groupby(self.colunas + ["balde"], observed=True, dropna=False).size()
+        linhas = bloco.groupby(self.colunas, observed=True, dropna=False).size()
+        cargos = df[self.colunas + ["cargo"]].dropna(subset=["cargo"])
+        cargos = cargos.groupby(self.colunas + ["cargo"], observed=True, dropna=False).size()
+
+        self.baldes = _somar(self.baldes, baldes)
+        self.linhas = _somar(self.linhas, linhas)
+        cargos = _somar(self.cargos, cargos.rename("contador").reset_index(), chaves=self.colunas + ["cargo"])
+        self.cargos = self._podar(cargos)
+
+    def _recortar(self, tabela, selecoes):
+        mascara = np.ones(len(tabela), dtype=bool)
+        for coluna, marcados in selecoes.items():
+            mascara &= tabela[coluna].isin(list(marcados)).to_numpy()
+        return tabela[mascara]
+
+    def quantis(self, selecoes, probabilidades=(0.5, 0.9)):
+        baldes = self._recortar(self.baldes.reset_index(name="quantidade"), selecoes)
+        if baldes.empty:
+            return [np.nan] * len(probabilidades)
+        contagem = baldes.groupby("balde")["quantidade"].sum().sort_index()
+        acumulado = contagem.cumsum().to_numpy()
+        # Mesmo critério do quantil "inferior": posição p * (n - 1) nas linhas ordenadas
+        posicoes = [np.searchsorted(acumulado, p * (acumulado[-1] - 1), side="right") for p in probabilidades]
+        return self._valor(contagem.index.to_numpy()[posicoes]).tolist()
+
+    def mais_frequentes(self, selecoes, quantos=1):
+        # Devolve [(cargo, contagem aproximada)] e o erro máximo de cada contagem
+        linhas = int(self._recortar(self.linhas.reset_index(name="n"), selecoes)["n"].sum())
+        cargos = self._recortar(self.cargos, selecoes).groupby("cargo", observed=True)["contador"].sum()
+        cargos = cargos.sort_index().sort_values(ascending=False, kind="stable")
+        return list(cargos.head(quantos).items()), linhas // (self.k + 1)
+
+
+def _somar(atual, novo, chaves=None):
+    # Junta dois resumos somando as contagens das mesmas chaves
+    if atual is None:
+        return novo
+    if chaves is None:
+        return pd.concat([atual, novo]).groupby(level=list(range(novo.index.nlevels)), dropna=False).sum()
+    return pd.concat([atual, novo], ignore_index=True).groupby(chaves, observed=True, dropna=False)["contador"].sum().reset_index()
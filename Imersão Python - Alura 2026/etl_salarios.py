@@ -0,0 +1,132 @@
+import argparse
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pycountry
+except ImportError:  # opcional: sem ele a coluna residencia_iso3 fica vazia
+    pycountry = None
+
+# --- ETL DOS SALÁRIOS (LIMPEZA DAS AULAS A01–A03 EM BLOCOS) ---
+# Os mesmos passos dos notebooks, mas lendo o salaries.csv bruto em blocos, então o tamanho do
+# arquivo não precisa caber na memória:
+#   1. renomeia as colunas para o português (ano, senioridade, contrato, ...);
+#   2. troca os códigos de senioridade, contrato, remoto e tamanho_empresa pelos nomes;
+#   3. dropna;
+#   4. ano como inteiro;
+#   5. residencia_iso3 (código de 3 letras do país, usado no mapa do A04) via pycountry.
+# As colunas de texto já saem como category (as trocas do passo 2 são feitas nas categorias,
+# não linha a linha) e o resultado é gravado em Parquet particionado por ano:
+#   destino/ano=2024/parte-00000.parquet, destino/ano=2025/parte-00000.parquet, ...
+# O A04 lê essa pasta com SALARIOS_PARQUET=<destino> (ver dados_salarios.py).
+# Uso: python etl_salarios.py salaries.csv salarios_particionado/ --bloco 200000
+# Nos notebooks a coluna se chamava "seneoridade"; aqui fica "senioridade", como o A04 espera.
+
+URL_BRUTO = "https://raw.githubusercontent.com/guilhermeonrails/data-jobs/refs/heads/main/salaries.csv"
+TAMANHO_BLOCO = 200_000
+
+RENOMEAR_COLUNAS = {
+    "work_year": "ano",
+    "experience_level": "senioridade",
+    "employment_type": "contrato",
+    "job_title": "cargo",
+    "salary": "salario",
+    "salary_currency": "moeda",
+    "salary_in_usd": "usd",
+    "employee_residence": "residencia",
+    "remote_ratio": "remoto",
+    "company_location": "empresa",
+    "company_size": "tamanho_empresa",
+}
+
+TROCAS = {
+    "senioridade": {"SE": "Sênior", "MI": "Pleno", "EN": "Júnior", "EX": "Executivo"},
+    "contrato": {"FT": "Tempo Integral", "CT": "Contrato", "PT": "Meio Período", "FL": "Freelancer"},
+    "remoto": {0: "Presencial", 100: "Remoto", 50: "Híbrido"},
+    "tamanho_empresa": {"M": "Médio", "L": "Grande", "S": "Pequeno"},
+}
+
+COLUNAS_TEXTO = ["senioridade", "contrato", "cargo", "moeda", "residencia", "remoto", "empresa", "tamanho_empresa"]
+
+_ISO3 = {}
+
+
+def iso3(codigo):
+    # "BR" -> "BRA"; códigos desconhecidos ficam vazios
+    if codigo not in _ISO3:
+        pais = pycountry.countries.get(alpha_2=codigo) if pycountry else None
+        _ISO3[codigo] = pais.alpha_3 if pais else None
+    return _ISO3[codigo]
+
+
+def limpar_bloco(bloco):
+    bloco = bloco.rename(columns=RENOMEAR_COLUNAS)
+
+    for coluna in COLUNAS_TEXTO:
+        bloco[coluna] = bloco[coluna].astype("category")
+    for coluna, troca in TROCAS.items():
+        # Trocar nas categorias equivale ao replace dos notebooks (valores fora do mapa ficam iguais)
+        categorias = bloco[coluna].cat.categories
+        bloco[coluna] = bloco[coluna].cat.rename_categories([troca.get(c, c) for c in categorias])
+    for coluna in COLUNAS_TEXTO:
+        bloco[coluna] = bloco[coluna].cat.reorder_categories(sorted(bloco[coluna].cat.categories, key=str))
+
+    bloco = bloco.dropna()
+    bloco = bloco.assign(ano=bloco["ano"].astype("int64"))
+
+    residencias = bloco["residencia"].cat.categories
+    bloco["residencia_iso3"] = bloco["residencia"].cat.rename_categories(
+        [iso3(c) or f"?{c}" for c in residencias]
+    )
+    # Os desconhecidos receberam um nome provisório só para não repetir categorias; viram vazio
+    desconhecidos = [c for c in bloco["residencia_iso3"].cat.categories if c.startswith("?")]
+    bloco["residencia_iso3"] = bloco["residencia_iso3"].cat.remove_categories(desconhecidos)
+    return bloco
+
+
+def gravar_particoes(bloco, pasta, numero):
+    # Uma parte por ano presente no bloco; a coluna ano fica no nome da pasta (ano=2024)
+    for ano, grupo in bloco.groupby("ano"):
+        destino = Path(pasta) / f"ano={ano}"
+        destino.mkdir(parents=True, exist_ok=True)
+        grupo.drop(columns="ano").to_parquet(destino / f"parte-{numero:05d}.parquet", index=False)
+
+
+def executar(origem=URL_BRUTO, destino="salarios_particionado", tamanho_bloco=TAMANHO_BLOCO):
+    # Grava numa pasta temporária e só troca pela definitiva no fim (nunca fica pela metade)
+    destino = Path(destino)
+    temporaria = destino.with_name(destino.name + ".tmp")
+    shutil.rmtree(temporaria, ignore_errors=True)
+    # Criada já aqui: um CSV só com cabeçalho vira uma pasta vazia, sem partições
+    temporaria.mkdir(parents=True)
+
+    lidas = gravadas = 0
+    for numero, bloco in enumerate(pd.read_csv(origem, chunksize=tamanho_bloco)):
+        lidas += len(bloco)
+        bloco = limpar_bloco(bloco)
+        gravadas += len(bloco)
+        gravar_particoes(bloco, temporaria, numero)
+
+    shutil.rmtree(destino, ignore_errors=True)
+    temporaria.rename(destino)
+    return {"linhas_lidas": lidas, "linhas_gravadas": gravadas, "particoes": sorted(p.name for p in destino.iterdir())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Limpa o salaries.csv bruto em blocos e grava Parquet particionado por ano.")
+    parser.add_argument("origem", nargs="?", default=URL_BRUTO, help="CSV bruto (caminho ou URL)")
+    parser.add_argument("destino", nargs="?", default="salarios_particionado", help="pasta de saída")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco")
+    args = parser.parse_args()
+
+    if pycountry is None:
+        print("Aviso: pycountry não está instalado; residencia_iso3 vai ficar vazia (pip install pycountry).")
+    resultado = executar(args.origem, args.destino, args.bloco)
+    print(f"{resultado['linhas_lidas']:,} linhas lidas, {resultado['linhas_gravadas']:,} gravadas em {args.destino}")
+    print("Partições:", ", ".join(resultado["particoes"]))
+
+
+if __name__ == "__main__":
+    main()
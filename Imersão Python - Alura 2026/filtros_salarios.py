@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# --- ÍNDICE DE FILTROS (BITMAPS) PARA A BARRA LATERAL DO A04 ---
+# Antes, cada rerun fazia um isin em cada coluna filtrada e um sorted(unique()) para cada widget.
+# Aqui isso é feito uma vez por versão dos dados: para cada valor de cada coluna de filtro
+# guardamos um bitmap (np.packbits, 1 bit por linha) com as linhas que têm aquele valor,
+# e a lista de opções já ordenada. Um filtro vira OR dos bitmaps dentro da coluna e AND
+# entre as colunas, em arrays 8x menores que uma máscara booleana.
+# Colunas com todas as opções marcadas não entram na conta.
+
+COLUNAS_FILTRO = ["ano", "senioridade", "contrato", "tamanho_empresa"]
+
+
+class IndiceFiltros:
+    def __init__(self, df, colunas=COLUNAS_FILTRO):
+        self.linhas = len(df)
+        self.opcoes = {}
+        self.bitmaps = {}
+        # Bitmap das linhas com valor preenchido, só nas colunas que têm vazios
+        # (isin nunca seleciona NaN, então "todas as opções" não é o mesmo que "todas as linhas")
+        self.preenchidos = {}
+
+        for coluna in colunas:
+            codigos, valores = pd.factorize(df[coluna], sort=True)
+            self.opcoes[coluna] = valores.tolist()
+            self.bitmaps[coluna] = {
+                valor: np.packbits(codigos == i) for i, valor in enumerate(self.opcoes[coluna])
+            }
+            if (codigos < 0).any():
+                self.preenchidos[coluna] = np.packbits(codigos >= 0)
+
+    def _bitmap_coluna(self, coluna, selecionados):
+        # OR dos valores marcados; None quando a coluna não restringe nada
+        bitmaps = self.bitmaps[coluna]
+        marcados = {valor for valor in selecionados if valor in bitmaps}
+        if len(marcados) == len(bitmaps):
+            return self.preenchidos.get(coluna)
+
+        if len(marcados) > len(bitmaps) / 2:
+            # Mais barato juntar os poucos desmarcados e inverter
+            desmarcados = [bitmaps[valor] for valor in bitmaps if valor not in marcados]
+            resultado = ~np.bitwise_or.reduce(desmarcados)
+            if coluna in self.preenchidos:
+                resultado &= self.preenchidos[coluna]
+            return resultado
+
+        if not marcados:
+            return np.zeros((self.linhas + 7) // 8, dtype="uint8")
+        return np.bitwise_or.reduce([bitmaps[valor] for valor in marcados])
+
+    def mascara(self, selecoes):
+        # selecoes: {coluna: valores marcados}. Devolve a máscara booleana das linhas
+        resultado = None
+        for coluna, selecionados in selecoes.items():
+            bitmap = self._bitmap_coluna(coluna, selecionados)
+            if bitmap is None:
+                continue
+            resultado = bitmap if resultado is None else resultado & bitmap
+        if resultado is None:
+            return np.ones(self.linhas, dtype=bool)
+        return np.unpackbits(resultado, count=self.linhas).astype(bool)
+
+    def filtrar(self, df, selecoes):
+        mascara = self.mascara(selecoes)
+        if mascara.all():
+            return df
+        return df.iloc[np.flatnonzero(mascara)]
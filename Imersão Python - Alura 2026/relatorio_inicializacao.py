@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# --- RELATÓRIO DE INICIALIZAÇÃO DO A04 ---
+# Mede quanto custa subir o dashboard:
+#   - o import de cada módulo pesado, cada um num Python novo (o custo de verdade de um
+#     servidor recém-iniciado, com as dependências dele);
+#   - a primeira execução do A04 (AppTest, sem navegador) e o tempo até os KPIs, que o
+#     próprio app guarda em st.session_state["ms_ate_kpis"];
+#   - um rerun e a abertura de cada seção.
+# Uso: python relatorio_inicializacao.py --csv dados.csv --limite-ms 1000
+# Com --limite-ms, termina com erro se o tempo até os KPIs do rerun passar do limite.
+
+PASTA = Path(__file__).parent
+MODULOS = [
+    "streamlit", "pandas", "numpy", "pyarrow", "plotly.express",
+    "dados_salarios", "filtros_salarios", "esbocos_salarios", "agregados_salarios", "tabela_salarios",
+]
+
+
+def tempo_import(modulo):
+    codigo = f"import time; t = time.perf_counter(); import {modulo}; print(time.perf_counter() - t)"
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=PASTA, capture_output=True, text=True)
+    if saida.returncode != 0:
+        return None
+    return float(saida.stdout.strip()) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de import e da primeira renderização do A04.")
+    parser.add_argument("--csv", help="CSV local (SALARIOS_CSV); sem ele, usa a configuração do ambiente")
+    parser.add_argument("--saida", help="arquivo JSON com o resultado")
+    parser.add_argument("--limite-ms", type=float, help="falha se o tempo até os KPIs do rerun passar disso")
+    args = parser.parse_args()
+
+    if args.csv:
+        os.environ["SALARIOS_CSV"] = str(Path(args.csv).resolve())
+        os.environ.setdefault("SALARIOS_CACHE", tempfile.mkdtemp(prefix="relatorio_a04_"))
+
+    imports = {modulo: tempo_import(modulo) for modulo in MODULOS}
+
+    sys.path.insert(0, str(PASTA))
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(PASTA / "A04_Imersão_Python.py"), default_timeout=600)
+    inicio = time.perf_counter()
+    app.run()
+    primeira = (time.perf_counter() - inicio) * 1000
+    if app.exception:
+        print("O app terminou com erro:", [e.value for e in app.exception])
+        sys.exit(1)
+    kpis_primeira = app.session_state["ms_ate_kpis"]
+
+    inicio = time.perf_counter()
+    app.run()
+    rerun = (time.perf_counter() - inicio) * 1000
+    kpis_rerun = app.session_state["ms_ate_kpis"]
+
+    secoes = {}
+    for secao in app.radio[0].options:
+        app.radio[0].set_value(secao)
+        inicio = time.perf_counter()
+        app.run()
+        secoes[secao] = (time.perf_counter() - inicio) * 1000
+
+    resultado = {
+        "imports_ms": imports,
+        "primeira_execucao_ms": primeira,
+        "primeira_ate_kpis_ms": kpis_primeira,
+        "rerun_ms": rerun,
+        "rerun_ate_kpis_ms": kpis_rerun,
+        "secoes_ms": secoes,
+    }
+
+    print(f"{'Import (Python novo)':<28}{'ms':>10}")
+    for modulo, ms in imports.items():
+        print(f"{modulo:<28}{'erro' if ms is None else f'{ms:.0f}':>10}")
+    print(f"\nPrimeira execução: {primeira:,.0f} ms (KPIs em {kpis_primeira:,.0f} ms)")
+    print(f"Rerun: {rerun:,.0f} ms (KPIs em {kpis_rerun:,.0f} ms)")
+    for secao, ms in secoes.items():
+        print(f"Seção \"{secao}\": {ms:,.0f} ms")
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.limite_ms and kpis_rerun > args.limite_ms:
+        print(f"\nKPIs do rerun em {kpis_rerun:.0f} ms, acima do limite de {args.limite_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# --- SALÁRIOS SINTÉTICOS ---
+# Gera um CSV no mesmo formato do dados-imersao-final.csv (colunas já limpas, como o A04 lê),
+# para benchmarks com qualquer quantidade de linhas e sem rede. O arquivo é escrito em blocos,
+# então 10 milhões de linhas não precisam caber na memória de uma vez.
+# O salário em usd segue uma lognormal por senioridade; salario e moeda saem do país de
+# residência com uma taxa fixa por moeda (a TabelaCambio recupera essas taxas dos dados).
+
+TAMANHO_BLOCO = 1_000_000
+
+ANOS = [2020, 2021, 2022, 2023, 2024, 2025]
+SENIORIDADES = {"Júnior": 60_000, "Pleno": 100_000, "Sênior": 150_000, "Executivo": 200_000}
+CONTRATOS = ["Tempo Integral", "Contrato", "Meio Período", "Freelancer"]
+PESOS_CONTRATOS = [0.94, 0.03, 0.02, 0.01]
+CARGOS = [
+    "Data Scientist", "Data Engineer", "Data Analyst", "Machine Learning Engineer",
+    "Analytics Engineer", "Research Scientist", "Data Architect", "Applied Scientist",
+    "Business Intelligence Analyst", "MLOps Engineer", "Data Manager", "AI Engineer",
+]
+REMOTO = ["Presencial", "Remoto", "Híbrido"]
+TAMANHOS = ["Pequeno", "Médio", "Grande"]
+# país (alpha-2, alpha-3) -> moeda e quantos dólares vale 1 unidade dela
+PAISES = [
+    ("US", "USA", "USD", 1.0),
+    ("GB", "GBR", "GBP", 1.27),
+    ("CA", "CAN", "CAD", 0.74),
+    ("DE", "DEU", "EUR", 1.08),
+    ("FR", "FRA", "EUR", 1.08),
+    ("ES", "ESP", "EUR", 1.08),
+    ("BR", "BRA", "BRL", 0.19),
+    ("IN", "IND", "INR", 0.012),
+]
+PESOS_PAISES = [0.6, 0.08, 0.08, 0.06, 0.05, 0.04, 0.05, 0.04]
+
+
+def gerar_salarios(linhas, semente=0):
+    rng = np.random.default_rng(semente)
+
+    senioridade = rng.integers(0, len(SENIORIDADES), linhas)
+    base = np.asarray(list(SENIORIDADES.values()), dtype="float64")[senioridade]
+    usd = np.round(base * rng.lognormal(0, 0.35, linhas)).astype("int64")
+
+    pais = rng.choice(len(PAISES), linhas, p=PESOS_PAISES)
+    residencia, residencia_iso3, moeda, taxa = (np.asarray(coluna, dtype=object) for coluna in zip(*PAISES))
+    salario = np.round(usd / taxa[pais].astype("float64")).astype("int64")
+
+    return pd.DataFrame({
+        "ano": np.asarray(ANOS)[rng.integers(0, len(ANOS), linhas)],
+        "senioridade": np.asarray(list(SENIORIDADES), dtype=object)[senioridade],
+        "contrato": np.asarray(CONTRATOS, dtype=object)[rng.choice(len(CONTRATOS), linhas, p=PESOS_CONTRATOS)],
+        "cargo": np.asarray(CARGOS, dtype=object)[rng.integers(0, len(CARGOS), linhas)],
+        "salario": salario,
+        "moeda": moeda[pais],
+        "usd": usd,
+        "residencia": residencia[pais],
+        "remoto": np.asarray(REMOTO, dtype=object)[rng.integers(0, len(REMOTO), linhas)],
+        # A empresa fica no mesmo país da residência, como na maior parte dos dados reais
+        "empresa": residencia[pais],
+        "tamanho_empresa": np.asarray(TAMANHOS, dtype=object)[rng.integers(0, len(TAMANHOS), linhas)],
+        "residencia_iso3": residencia_iso3[pais],
+    })
+
+
+def salvar_csv(caminho, linhas, semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    # Um bloco por vez, cada um com a própria semente; o cabeçalho só no primeiro
+    for numero, inicio in enumerate(range(0, linhas, tamanho_bloco)):
+        bloco = gerar_salarios(min(tamanho_bloco, linhas - inicio), semente=semente + numero)
+        bloco.to_csv(caminho, mode="w" if numero == 0 else "a", header=numero == 0, index=False, encoding="utf-8")
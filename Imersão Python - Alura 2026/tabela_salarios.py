@@ -0,0 +1,86 @@
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --- TABELA PAGINADA DO A04 ---
+# O st.dataframe(df_filtrado) mandava todas as linhas filtradas para o navegador a cada rerun.
+# Aqui a busca, a ordenação e a paginação rodam no servidor, sobre o DataFrame em cache, e
+# só a página visível vai para o navegador:
+#   - a ordem de cada coluna é calculada uma vez (argsort estável) e reaproveitada por qualquer
+#     combinação de filtros: basta percorrer a ordem global e ficar com as linhas da máscara;
+#   - a busca compara o texto só com os valores distintos da coluna e depois expande para as
+#     linhas pelos códigos (factorize), em vez de testar linha por linha.
+# Para quem precisa de tudo, exportar() gera CSV com o pyarrow (bem mais rápido que o to_csv)
+# ou Parquet.
+
+LINHAS_POR_PAGINA = [25, 50, 100, 500]
+
+
+class TabelaSalarios:
+    def __init__(self, df):
+        self.df = df
+        self._ordens = {}
+        self._codigos = {}
+        self._trava = threading.Lock()
+
+    def _ordem(self, coluna):
+        # Posições das linhas ordenadas pela coluna (vazios no fim) e quantos valores preenchidos
+        with self._trava:
+            if coluna not in self._ordens:
+                valores = self.df[coluna].reset_index(drop=True)
+                ordem = valores.sort_values(kind="stable", na_position="last").index.to_numpy()
+                self._ordens[coluna] = (ordem, int(valores.notna().sum()))
+            return self._ordens[coluna]
+
+    def _fatorado(self, coluna):
+        with self._trava:
+            if coluna not in self._codigos:
+                codigos, valores = pd.factorize(self.df[coluna])
+                self._codigos[coluna] = (codigos, pd.Index(valores).astype(str))
+            return self._codigos[coluna]
+
+    def buscar(self, coluna, termo):
+        # Máscara das linhas cuja coluna contém o termo (sem diferenciar maiúsculas)
+        codigos, valores = self._fatorado(coluna)
+        encontrados = np.append(valores.str.contains(termo, case=False, regex=False), False)
+        # Código -1 (vazio) aponta para o False acrescentado no fim
+        return encontrados[codigos]
+
+    def posicoes(self, mascara, coluna=None, ascendente=True):
+        # Posições (iloc) das linhas da máscara, na ordem pedida
+        if coluna is None:
+            return np.flatnonzero(mascara)
+        ordem, preenchidos = self._ordem(coluna)
+        if not ascendente:
+            ordem = np.concatenate([ordem[:preenchidos][::-1], ordem[preenchidos:]])
+        return ordem[mascara[ordem]]
+
+    def pagina(self, posicoes, numero, tamanho):
+        # numero começa em 1
+        inicio = (numero - 1) * tamanho
+        return self.df.iloc[posicoes[inicio:inicio + tamanho]]
+
+    def exportar(self, posicoes, formato="csv"):
+        # pyarrow só é importado quando alguém exporta
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+
+        tabela = pa.Table.from_pandas(self.df.iloc[posicoes], preserve_index=False)
+        saida = io.BytesIO()
+        if formato == "parquet":
+            pq.write_table(tabela, saida)
+        else:
+            # O escritor de CSV não aceita colunas dictionary (category): volta para o tipo dos valores
+            tabela = pa.table({
+                nome: coluna.cast(coluna.type.value_type) if pa.types.is_dictionary(coluna.type) else coluna
+                for nome, coluna in zip(tabela.column_names, tabela.columns)
+            })
+            pa_csv.write_csv(tabela, saida)
+        return saida.getvalue()
+
+
+def total_paginas(linhas, tamanho):
+    return max(1, -(-linhas // tamanho))
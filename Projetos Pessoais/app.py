@@ -1,16 +1,47 @@
+import os
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 import plotly.express as px
 
+from banco_lancamentos import BancoLancamentos
+from leitura_planilhas import LeitorPlanilhas
+from sincronizacao import FONTES, SincronizadorPlanilha
+from snapshot import CacheLancamentos
+from cubo import CuboLancamentos
+from esquema import COLUNAS_DERIVADAS
+from graficos import reduzir_series
+from medicao import SEGUNDO_PLANO, finalizar_execucao, iniciar_execucao, medido, medir
+from planilha_fake import ClienteFake
+from saldos import IndiceSaldo
+from tratamento import tratar_dados
+
 # --- CONFIGURAÇÃO DA PÁGINA ---
 st.set_page_config(layout="wide", page_title="Controle Financeiro Real-Time")
 
 
 # --- FUNÇÃO PARA CARREGAR DADOS ---
-@st.cache_data(ttl=60)
-def load_data():
+# As abas lidas (FONTES) ficam em sincronizacao.py e o tratamento (tratar_dados) em
+# tratamento.py, para o banco_lancamentos.py importar a planilha do mesmo jeito.
+
+# PLANILHA_CSV=<arquivo> troca o Google Sheets por uma planilha local (ClienteFake),
+# usado pelo benchmark_dashboard.py e para rodar sem credenciais
+PLANILHA_CSV = os.environ.get("PLANILHA_CSV")
+# BANCO_LANCAMENTOS=<arquivo.sqlite> lê de um banco local em vez da planilha: filtros e somas
+# viram consultas SQL e nada é baixado do Google (ver banco_lancamentos.py)
+BANCO_LANCAMENTOS = os.environ.get("BANCO_LANCAMENTOS")
+
+
+# Cliente autorizado uma vez por processo, reaproveitado por todas as sincronizações
+@st.cache_resource
+def obter_cliente():
+    if PLANILHA_CSV:
+        arquivo, aba = FONTES[0]
+        return ClienteFake.de_csv(PLANILHA_CSV, arquivo=arquivo, aba=aba)
+
     scope = ["https://www.googleapis.com/auth/spreadsheets",
              "https://www.googleapis.com/auth/drive"]
 
@@ -23,46 +54,302 @@ def load_data():
         except:
             creds = Credentials.from_service_account_file("credentials.json", scopes=scope)
 
-    client = gspread.authorize(creds)
-    spreadsheet = client.open("Controle Financeiro Mensal com Gráficos")
-    sheet = spreadsheet.worksheet("Controle de Gastos")
-
-    data = sheet.get_all_records()
-    df = pd.DataFrame(data)
-
-    if 'Valor' in df.columns:
-        df['Valor'] = (
-            df['Valor']
-            .astype(str)
-            .str.replace('R$', '', regex=False)
-            .str.replace(' ', '', regex=False)
-            .str.replace('.', '', regex=False)
-            .str.replace(',', '.', regex=False)
-            .str.strip()
+    return gspread.authorize(creds)
+
+
+PASTA_CACHE = Path(os.environ.get("DASHBOARD_CACHE", Path(__file__).parent / ".cache"))
+CAMINHO_SNAPSHOT = PASTA_CACHE / "lancamentos.parquet"
+
+
+# O sincronizador vive enquanto o processo estiver de pé e lembra até onde a planilha já foi lida,
+# então cada atualização busca só as linhas novas (ver sincronizacao.py).
+# O CacheLancamentos serve o último snapshot em disco e atualiza em segundo plano (ver snapshot.py).
+@st.cache_resource
+def obter_cache():
+    leitor = LeitorPlanilhas(obter_cliente)
+    return CacheLancamentos(SincronizadorPlanilha(leitor, FONTES, tratar_dados), CAMINHO_SNAPSHOT)
+
+
+def load_data():
+    return obter_cache().obter()
+
+
+@st.cache_resource
+def obter_banco():
+    return BancoLancamentos(BANCO_LANCAMENTOS)
+
+
+# Índice de saldos montado uma vez por versão dos dados (ver saldos.py)
+@st.cache_resource(max_entries=2)
+def obter_indice_saldo(_df, versao):
+    return IndiceSaldo(_df)
+
+
+# Um cubo por processo, atualizado quando a versão dos dados muda (ver cubo.py)
+@st.cache_resource
+def obter_cubo():
+    return CuboLancamentos()
+
+
+# --- VISÕES DERIVADAS EM CACHE ---
+# Cada visão fica em cache pela versão dos dados + os filtros que ela usa, então trocar um
+# widget só recalcula o que depende dele. O cubo e o df entram com "_" (fora da chave):
+# quem identifica o conteúdo deles é a versão.
+@st.cache_data(max_entries=32, show_spinner=False)
+def figura_evolucao(_cubo, versao, categorias, mes, intervalo_ms, data_referencia):
+    df_plot = _cubo.evolucao(list(categorias), mes=mes)
+
+    # O Status do gráfico é a coluna Status_Grafico do tratamento, já somada no cubo
+    # Muitos pontos: WebGL e séries reduzidas com LTTB (ver graficos.py)
+    df_plot, usar_webgl = reduzir_series(df_plot, 'Data', 'Valor_Grafico', 'Status')
+    fig_evolucao = px.line(df_plot, x='Data', y='Valor_Grafico', color='Status', markers=True,
+                           render_mode="webgl" if usar_webgl else "auto",
+                           color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
+                           category_orders={"Status": ["Receitas", "Despesas"]},
+                           template="plotly_dark", custom_data=['Categoria', 'Valor'],
+                           labels={"Valor_Grafico": "Valor (R$)", "Data": "Data"})
+
+    fig_evolucao.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
+    fig_evolucao.update_layout(hovermode="closest",
+                               legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    fig_evolucao.update_traces(
+        hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Valor Real:</b> R$ %{customdata[1]:,.2f}<br><b>Categoria:</b> %{customdata[0]}<extra></extra>")
+    return fig_evolucao
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def figura_investimentos(_cubo, versao, mes, categorias, intervalo_ms, data_referencia):
+    # Devolve (figura ou None, saldo das movimentações no período)
+    df_invest_plot = _cubo.investimentos(mes=mes, categorias=None if categorias is None else list(categorias))
+    if df_invest_plot.empty:
+        return None, 0.0
+
+    df_invest_grafico, usar_webgl = reduzir_series(df_invest_plot, 'Data', 'Valor', 'Categoria')
+    fig_invest = px.line(df_invest_grafico, x='Data', y='Valor', color='Categoria', markers=True,
+                         render_mode="webgl" if usar_webgl else "auto",
+                         template="plotly_dark", color_discrete_sequence=px.colors.sequential.Greens_r,
+                         labels={"Valor": "Valor (R$)", "Data": "Data"})
+
+    fig_invest.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
+    fig_invest.update_traces(
+        hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Movimentação:</b> R$ %{y:,.2f}<extra></extra>")
+    return fig_invest, df_invest_plot["Valor"].sum()
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def figuras_mensais(_cubo, versao, mes, categorias):
+    # Devolve (resumo por categoria com a linha TOTAL, pizza, recorrência); vazio se o mês não tem gastos
+    resumo_cat = _cubo.gastos_por_categoria(mes, list(categorias))
+    if resumo_cat.empty:
+        return None, None, None
+
+    fig_pizza = px.pie(
+        resumo_cat,
+        values="Valor",
+        names="Categoria",
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Plotly
+    )
+    fig_pizza.update_traces(
+        hovertemplate="<b>Categoria:</b> %{label}<br><b>Valor:</b> R$ %{value:,.2f}<br><b>Percentual:</b> %{percent}<extra></extra>")
+
+    df_rec_plot = _cubo.gastos_por_recorrencia(mes, list(categorias))
+    fig_recorrencia = px.bar(
+        df_rec_plot,
+        x="Recorrência",
+        y="Valor_Abs",
+        color="Recorrência",
+        template="plotly_dark",
+        color_discrete_map={
+            "Fixos": "#5DADE2",
+            "Recorrentes": "#F4D03F",
+            "Não Recorrentes": "#e74c3c"
+        },
+        category_orders={"Recorrência": ["Fixos", "Recorrentes", "Não Recorrentes"]},
+        labels={"Valor_Abs": "Total (R$)"}
+    )
+    fig_recorrencia.update_traces(
+        hovertemplate="<b>Recorrência:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>"
+    )
+
+    total_gastos = resumo_cat["Valor"].sum()
+    linha_total = pd.DataFrame({"Categoria": ["TOTAL"], "Valor": [total_gastos]})
+    resumo_final = pd.concat([resumo_cat, linha_total], ignore_index=True)
+    return resumo_final, fig_pizza, fig_recorrencia
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def lancamentos_do_mes(_fonte, versao, mes, categorias, ascendente):
+    # _fonte: o DataFrame completo ou o BancoLancamentos (que já devolve só as linhas do filtro)
+    if isinstance(_fonte, BancoLancamentos):
+        df_mes = _fonte.lancamentos_do_mes(mes, list(categorias))
+    else:
+        df_mes = _fonte[(_fonte['Mes_Ano'] == mes) & _fonte["Categoria"].isin(list(categorias))]
+    # Colunas da planilha, sem a última (como o antigo iloc[:, :-3], que também tirava Mes_Ano e Mes_Ano_Exibicao)
+    colunas_lista = [c for c in df_mes.columns if c not in COLUNAS_DERIVADAS][:-1]
+    df_lista = df_mes[colunas_lista].sort_values("Data", ascending=ascendente)
+    df_lista['Data'] = df_lista['Data'].dt.strftime('%d/%m/%Y')
+    return df_lista
+
+
+def highlight_total(row):
+    return ['background-color: #990000; color: white; font-weight: bold' if row.Categoria == 'TOTAL' else ''
+            for _ in row]
+
+
+def color_valor_custom(val):
+    # Mantemos as cores visuais, mas a lógica de filtro já separou corretamente acima
+    color = '#2ecc71' if val > 0 else '#e74c3c'
+    return f'color: {color}; font-weight: bold'
+
+
+# --- SEÇÕES ---
+# Cada seção é um st.fragment: um widget dentro dela (como o "Ordenar por data") reexecuta
+# só aquela seção, não o script inteiro.
+@st.fragment
+@medido("seção: evolução")
+def secao_evolucao(cubo, versao, categorias, mes, intervalo_ms, data_referencia):
+    st.subheader("📈 Evolução Financeira Detalhada")
+    with medir("figura: evolução"):
+        fig_evolucao = figura_evolucao(cubo, versao, categorias, mes, intervalo_ms, data_referencia)
+    st.plotly_chart(fig_evolucao, use_container_width=True)
+
+
+@st.fragment
+@medido("seção: investimentos")
+def secao_investimentos(cubo, versao, mes, categorias, intervalo_ms, data_referencia, texto_periodo,
+                        total_invest_acumulado):
+    st.subheader(f"💰 Evolução de Investimentos ({texto_periodo})")
+
+    cor_valor = "#2ecc71" if total_invest_acumulado >= 0 else "#e74c3c"
+    st.write(
+        f'<p style="font-size:16px; font-weight:bold;">Total Investido: <span style="color:{cor_valor};">R$ {total_invest_acumulado:,.2f}</span></p>',
+        unsafe_allow_html=True)
+
+    with medir("figura: investimentos"):
+        fig_invest, total_inv_periodo = figura_investimentos(cubo, versao, mes, categorias, intervalo_ms,
+                                                             data_referencia)
+    if fig_invest is not None:
+        st.plotly_chart(fig_invest, use_container_width=True)
+        st.info(f"💸 Saldo de movimentações em investimentos em {texto_periodo}: **R$ {total_inv_periodo:,.2f}**")
+    else:
+        st.info(f"Nenhum registro de 'Investimento' encontrado.")
+
+
+@st.fragment
+@medido("seção: análises mensais")
+def secao_analises_mensais(cubo, versao, mes, categorias, receitas_total, saidas_total_abs):
+    st.header("🎯 Análises Mensais")
+
+    with medir("figura: pizza, recorrência e resumo"):
+        resumo_final, fig_pizza, fig_recorrencia = figuras_mensais(cubo, versao, mes, categorias)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("Distribuição de Gastos")
+        if fig_pizza is not None:
+            st.plotly_chart(fig_pizza, use_container_width=True)
+    with c2:
+        st.subheader("Balanço Mensal")
+        with medir("figura: balanço"):
+            df_balanco = pd.DataFrame({
+                'Status': ['Receitas', 'Despesas'],
+                'Total': [receitas_total, saidas_total_abs]
+            })
+            fig_bar = px.bar(df_balanco, x='Status', y='Total', color='Status',
+                             color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
+                             labels={"Total": "Valor (R$)"})
+            fig_bar.update_traces(hovertemplate="<b>Status:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>")
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+    # --- NOVO GRÁFICO: RECORRÊNCIA DOS GASTOS ---
+    st.subheader("🔄 Recorrência dos Gastos")
+    if fig_recorrencia is not None:
+        st.plotly_chart(fig_recorrencia, use_container_width=True)
+
+    # --- RESUMO POR CATEGORIA ---
+    st.markdown("### 📋 Resumo de Gastos por Categoria")
+    if resumo_final is not None:
+        with medir("styler: resumo por categoria"):
+            resumo_styled = (
+                resumo_final.style
+                .apply(highlight_total, axis=1)
+                .format({"Valor": "R$ {:,.2f}"})
+            )
+
+            st.dataframe(resumo_styled, use_container_width=True, hide_index=True)
+    else:
+        st.info("Sem gastos registrados para este mês.")
+
+
+@st.fragment
+@medido("seção: lançamentos")
+def secao_lancamentos(fonte, versao, mes, mes_visual, categorias, receitas_total, saidas_total_abs):
+    with st.expander(f"🔍 Lista de lançamentos - {mes_visual}"):
+
+        col_rec, col_desp = st.columns(2)
+        col_rec.markdown(f"**Total Receitas:** <span style='color:#2ecc71'>R$ {receitas_total:,.2f}</span>",
+                         unsafe_allow_html=True)
+        col_desp.markdown(
+            f"**Total Despesas:** <span style='color:#e74c3c'>R$ {saidas_total_abs:,.2f}</span>",
+            unsafe_allow_html=True)
+
+        st.divider()
+
+        ordem = st.radio(
+            "Ordenar por data:",
+            ["Mais recentes", "Mais antigas"],
+            horizontal=True
         )
-        df['Valor'] = pd.to_numeric(df['Valor'], errors='coerce').fillna(0)
 
-    if 'Data' in df.columns:
-        df['Data'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
-        df = df.dropna(subset=['Data']).sort_values('Data')
-        df['Mes_Ano'] = df['Data'].dt.strftime('%Y-%m')
-        df['Mes_Ano_Exibicao'] = df['Data'].dt.strftime('%m/%Y')
+        ascendente = True if ordem == "Mais antigas" else False
+        with medir("filtro: lançamentos do mês"):
+            df_lista = lancamentos_do_mes(fonte, versao, mes, categorias, ascendente)
 
-    return df
+        with medir("styler: lançamentos"):
+            lista_styled = (
+                df_lista.style
+                .map(color_valor_custom, subset=['Valor'])
+                .format({"Valor": "R$ {:,.2f}"})
+            )
+
+            st.dataframe(lista_styled, use_container_width=True, hide_index=True)
 
 
 # --- INTERFACE DO DASHBOARD ---
+# ?debug=1 na URL (ou DASHBOARD_DEBUG=1) mostra os tempos de cada etapa na sidebar
+modo_debug = st.query_params.get("debug") == "1" or os.environ.get("DASHBOARD_DEBUG") == "1"
+iniciar_execucao()
+
 try:
-    df = load_data()
+    if BANCO_LANCAMENTOS:
+        banco = obter_banco()
+        versao_dados = banco.versao
+        vazio = banco.vazio
+    else:
+        with medir("dados: carregar"):
+            df, versao_dados = load_data()
+        vazio = df.empty
 
-    if df.empty:
+    if vazio:
         st.warning("Aguardando dados válidos na planilha.")
     else:
         st.title("📊 Meu Dashboard Financeiro")
 
+        # De onde vêm os agregados (cubo), os saldos (indice_saldo) e a lista de lançamentos (fonte)
+        if BANCO_LANCAMENTOS:
+            # O banco responde às mesmas consultas do cubo e do índice de saldos
+            cubo = indice_saldo = fonte = banco
+        else:
+            with medir("dados: cubo"):
+                cubo = obter_cubo().atualizar(df, versao_dados, obter_cache().sincronizador.novos_desde)
+            with medir("dados: índice de saldos"):
+                indice_saldo = obter_indice_saldo(df, versao_dados)
+            fonte = df
+
         # --- SIDEBAR (FILTROS) ---
         st.sidebar.header("Configurações de Filtro")
-        df_meses = df[['Mes_Ano_Exibicao', 'Mes_Ano']].drop_duplicates().sort_values('Mes_Ano', ascending=False)
+        df_meses = cubo.meses()
         lista_exibicao = df_meses['Mes_Ano_Exibicao'].tolist()
 
         mes_visual = st.sidebar.selectbox("Mês de análise detalhada", lista_exibicao)
@@ -71,7 +358,7 @@ try:
         ver_tudo = st.sidebar.checkbox("Visualizar todo o histórico no gráfico", value=False)
 
         # Lógica para Selecionar Todas as Categorias
-        lista_cat = sorted([c for c in df["Categoria"].unique().tolist() if c])
+        lista_cat = cubo.categorias()
 
         if "selecao_categorias" not in st.session_state:
             st.session_state.selecao_categorias = lista_cat
@@ -81,46 +368,35 @@ try:
 
         cat_escolhidas = st.sidebar.multiselect("Filtrar Categorias", lista_cat, key="selecao_categorias")
 
-        # --- PREPARAÇÃO DOS DADOS (LÓGICA DE FILTRO ADICIONADA) ---
-        df_mes_base = df[df['Mes_Ano'] == mes_selecionado]
-        df_mes = df_mes_base[df_mes_base["Categoria"].isin(cat_escolhidas)]
-
-        # Criamos uma máscara para identificar o que é investimento
-        is_invest = df_mes['Categoria'].str.contains("Investimento", case=False, na=False)
+        # Tupla para servir de chave dos caches
+        categorias = tuple(cat_escolhidas)
 
+        # --- PREPARAÇÃO DOS DADOS (LÓGICA DE FILTRO ADICIONADA) ---
         # Receitas: (Outros > 0) OU (Investimento < 0 [Resgate])
-        df_mes_Receitas = df_mes[((df_mes['Valor'] > 0) & (~is_invest)) | ((df_mes['Valor'] < 0) & (is_invest))]
-
         # Saídas: (Outros < 0) OU (Investimento > 0 [Aplicação])
-        df_mes_saidas = df_mes[((df_mes['Valor'] < 0) & (~is_invest)) | ((df_mes['Valor'] > 0) & (is_invest))]
-
-        data_referencia = df['Data'].min().replace(day=1)
+        # A regra fica em tratamento.classificar_lancamentos (coluna Status, calculada na carga)
+        # Os totais já vêm somados do cubo; as linhas brutas do mês só são usadas na lista de lançamentos
+        data_referencia = cubo.primeira_data().replace(day=1)
 
         if ver_tudo:
-            df_para_evolucao = df[df["Categoria"].isin(cat_escolhidas)]
-            df_para_investimentos = df
+            mes_evolucao, cat_investimentos = None, None
             texto_periodo = "Histórico Total"
             intervalo_ms = 10 * 24 * 60 * 60 * 1000
         else:
-            df_para_evolucao = df_mes
-            df_para_investimentos = df_mes
+            mes_evolucao, cat_investimentos = mes_selecionado, categorias
             texto_periodo = mes_visual
             intervalo_ms = 5 * 24 * 60 * 60 * 1000
 
         # --- MÉTRICAS DO MÊS ---
         # Somamos os valores absolutos para as métricas de exibição
-        Receitas_total = df_mes_Receitas['Valor'].abs().sum()
-        saidas_total_abs = df_mes_saidas['Valor'].abs().sum()
+        Receitas_total, saidas_total_abs = cubo.totais_mes(mes_selecionado, cat_escolhidas)
         saldo_mensal = Receitas_total - saidas_total_abs
 
-        data_limite = df_mes_base['Data'].max()
+        data_limite = cubo.ultima_data(mes_selecionado)
 
-        # Para o saldo acumulado, precisamos garantir que o investimento positivo subtraia e o negativo some
-        df_acum_temp = df[df['Data'] <= data_limite].copy()
-        is_invest_acum = df_acum_temp['Categoria'].str.contains("Investimento", case=False, na=False)
-        # Invertemos o sinal do investimento para o cálculo do saldo:
-        df_acum_temp.loc[is_invest_acum, 'Valor'] = -df_acum_temp.loc[is_invest_acum, 'Valor']
-        saldo_acumulado = df_acum_temp['Valor'].sum()
+        # Para o saldo acumulado, o investimento positivo subtrai e o negativo soma;
+        # o índice já guarda essas somas acumuladas por data
+        saldo_acumulado = indice_saldo.saldo_ate(data_limite)
 
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("Receitas", f"R$ {Receitas_total:,.2f}")
@@ -131,194 +407,31 @@ try:
         st.divider()
 
         # --- GRÁFICO 1: EVOLUÇÃO FINANCEIRA ---
-        st.subheader("📈 Evolução Financeira Detalhada")
-
-        df_para_evolucao = df_para_evolucao.copy()
-
-
-        # Ajuste do status no gráfico para refletir a nova lógica
-        def definir_status(row):
-            if "Investimento" in str(row['Categoria']):
-                return 'Receitas' if row['Valor'] < 0 else 'Despesas'
-            return 'Receitas' if row['Valor'] > 0 else 'Despesas'
-
-
-        df_para_evolucao['Status'] = df_para_evolucao.apply(definir_status, axis=1)
-
-        df_plot = df_para_evolucao.groupby(['Data', 'Status', 'Categoria'])['Valor'].sum().reset_index()
-        df_plot['Valor_Grafico'] = df_plot['Valor'].abs()
-
-        fig_evolucao = px.line(df_plot, x='Data', y='Valor_Grafico', color='Status', markers=True,
-                               color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
-                               category_orders={"Status": ["Receitas", "Despesas"]},
-                               template="plotly_dark", custom_data=['Categoria', 'Valor'],
-                               labels={"Valor_Grafico": "Valor (R$)", "Data": "Data"})
-
-        fig_evolucao.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
-        fig_evolucao.update_layout(hovermode="closest",
-                                   legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-        fig_evolucao.update_traces(
-            hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Valor Real:</b> R$ %{customdata[1]:,.2f}<br><b>Categoria:</b> %{customdata[0]}<extra></extra>")
-        st.plotly_chart(fig_evolucao, use_container_width=True)
+        secao_evolucao(cubo, versao_dados, categorias, mes_evolucao, intervalo_ms, data_referencia)
 
         # --- SEÇÃO: EVOLUÇÃO DE INVESTIMENTOS ---
         st.divider()
-        st.subheader(f"💰 Evolução de Investimentos ({texto_periodo})")
-
-        total_invest_acumulado = df[df["Categoria"].str.contains("Investimento", case=False, na=False)]["Valor"].sum()
-        cor_valor = "#2ecc71" if total_invest_acumulado >= 0 else "#e74c3c"
-        st.write(
-            f'<p style="font-size:16px; font-weight:bold;">Total Investido: <span style="color:{cor_valor};">R$ {total_invest_acumulado:,.2f}</span></p>',
-            unsafe_allow_html=True)
-
-        df_invest = df_para_investimentos[
-            df_para_investimentos["Categoria"].str.contains("Investimento", case=False, na=False)]
-
-        if not df_invest.empty:
-            df_invest_plot = df_invest.groupby(['Data', 'Categoria'])['Valor'].sum().reset_index()
-            fig_invest = px.line(df_invest_plot, x='Data', y='Valor', color='Categoria', markers=True,
-                                 template="plotly_dark", color_discrete_sequence=px.colors.sequential.Greens_r,
-                                 labels={"Valor": "Valor (R$)", "Data": "Data"})
-
-            fig_invest.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
-            fig_invest.update_traces(
-                hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Movimentação:</b> R$ %{y:,.2f}<extra></extra>")
-            st.plotly_chart(fig_invest, use_container_width=True)
-
-            total_inv_periodo = df_invest["Valor"].sum()
-            st.info(f"💸 Saldo de movimentações em investimentos em {texto_periodo}: **R$ {total_inv_periodo:,.2f}**")
-        else:
-            st.info(f"Nenhum registro de 'Investimento' encontrado.")
+        secao_investimentos(cubo, versao_dados, mes_evolucao, cat_investimentos, intervalo_ms, data_referencia,
+                            texto_periodo, indice_saldo.investido_ate())
 
         # --- SEÇÃO: ANÁLISES MENSAIS ---
         st.divider()
-        st.header("🎯 Análises Mensais")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            st.subheader("Distribuição de Gastos")
-            df_pizza = df_mes_saidas.copy()
-            df_pizza['Valor'] = df_pizza['Valor'].abs()
-            if not df_pizza.empty:
-                fig_pizza = px.pie(
-                    df_pizza,
-                    values="Valor",
-                    names="Categoria",
-                    hole=0.4,
-                    color_discrete_sequence=px.colors.qualitative.Plotly
-                )
-                fig_pizza.update_traces(
-                    hovertemplate="<b>Categoria:</b> %{label}<br><b>Valor:</b> R$ %{value:,.2f}<br><b>Percentual:</b> %{percent}<extra></extra>")
-                st.plotly_chart(fig_pizza, use_container_width=True)
-        with c2:
-            st.subheader("Balanço Mensal")
-            df_balanco = pd.DataFrame({
-                'Status': ['Receitas', 'Despesas'],
-                'Total': [Receitas_total, saidas_total_abs]
-            })
-            fig_bar = px.bar(df_balanco, x='Status', y='Total', color='Status',
-                             color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
-                             labels={"Total": "Valor (R$)"})
-            fig_bar.update_traces(hovertemplate="<b>Status:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>")
-            st.plotly_chart(fig_bar, use_container_width=True)
-
-        # --- NOVO GRÁFICO: RECORRÊNCIA DOS GASTOS ---
-        st.subheader("🔄 Recorrência dos Gastos")
-        if not df_mes_saidas.empty:
-            df_rec = df_mes_saidas.copy()
-            df_rec['Valor_Abs'] = df_rec['Valor'].abs()
-
-            df_rec_plot = df_rec[df_rec['Recorrência'] != 'Receitas'].groupby("Recorrência")[
-                "Valor_Abs"].sum().reset_index()
-
-            fig_recorrencia = px.bar(
-                df_rec_plot,
-                x="Recorrência",
-                y="Valor_Abs",
-                color="Recorrência",
-                template="plotly_dark",
-                color_discrete_map={
-                    "Fixos": "#5DADE2",
-                    "Recorrentes": "#F4D03F",
-                    "Não Recorrentes": "#e74c3c"
-                },
-                category_orders={"Recorrência": ["Fixos", "Recorrentes", "Não Recorrentes"]},
-                labels={"Valor_Abs": "Total (R$)"}
-            )
-
-            fig_recorrencia.update_traces(
-                hovertemplate="<b>Recorrência:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>"
-            )
-            st.plotly_chart(fig_recorrencia, use_container_width=True)
-
-        # --- RESUMO POR CATEGORIA ---
-        st.markdown("### 📋 Resumo de Gastos por Categoria")
-        if not df_mes_saidas.empty:
-            resumo_cat = (
-                df_mes_saidas.groupby("Categoria")["Valor"]
-                .sum()
-                .abs()
-                .reset_index()
-                .sort_values(by="Valor", ascending=False)
-            )
-
-            total_gastos = resumo_cat["Valor"].sum()
-            linha_total = pd.DataFrame({"Categoria": ["TOTAL"], "Valor": [total_gastos]})
-            resumo_final = pd.concat([resumo_cat, linha_total], ignore_index=True)
-
-
-            def highlight_total(row):
-                return ['background-color: #990000; color: white; font-weight: bold' if row.Categoria == 'TOTAL' else ''
-                        for _ in row]
-
-
-            resumo_styled = (
-                resumo_final.style
-                .apply(highlight_total, axis=1)
-                .format({"Valor": "R$ {:,.2f}"})
-            )
-
-            st.dataframe(resumo_styled, use_container_width=True, hide_index=True)
-        else:
-            st.info("Sem gastos registrados para este mês.")
+        secao_analises_mensais(cubo, versao_dados, mes_selecionado, categorias, Receitas_total, saidas_total_abs)
 
         # --- LISTA DE LANÇAMENTOS COM FILTRO DE ORDENAÇÃO ---
-        with st.expander(f"🔍 Lista de lançamentos - {mes_visual}"):
-
-            col_rec, col_desp = st.columns(2)
-            col_rec.markdown(f"**Total Receitas:** <span style='color:#2ecc71'>R$ {Receitas_total:,.2f}</span>",
-                             unsafe_allow_html=True)
-            col_desp.markdown(
-                f"**Total Despesas:** <span style='color:#e74c3c'>R$ {saidas_total_abs:,.2f}</span>",
-                unsafe_allow_html=True)
-
-            st.divider()
-
-            ordem = st.radio(
-                "Ordenar por data:",
-                ["Mais recentes", "Mais antigas"],
-                horizontal=True
-            )
-
-            df_lista = df_mes.iloc[:, :-3].copy()
-            ascendente = True if ordem == "Mais antigas" else False
-            df_lista = df_lista.sort_values("Data", ascending=ascendente)
-            df_lista['Data'] = df_lista['Data'].dt.strftime('%d/%m/%Y')
-
-
-            def color_valor_custom(val):
-                # Mantemos as cores visuais, mas a lógica de filtro já separou corretamente acima
-                color = '#2ecc71' if val > 0 else '#e74c3c'
-                return f'color: {color}; font-weight: bold'
-
-
-            lista_styled = (
-                df_lista.style
-                .map(color_valor_custom, subset=['Valor'])
-                .format({"Valor": "R$ {:,.2f}"})
-            )
-
-            st.dataframe(lista_styled, use_container_width=True, hide_index=True)
+        secao_lancamentos(fonte, versao_dados, mes_selecionado, mes_visual, categorias, Receitas_total,
+                          saidas_total_abs)
 
 except Exception as e:
-    st.error(f"Erro crítico no processamento: {e}")
\ No newline at end of file
+    st.error(f"Erro crítico no processamento: {e}")
+
+# --- PAINEL DE DEPURAÇÃO (TEMPOS) ---
+execucao = finalizar_execucao(script="app.py")
+if modo_debug:
+    with st.sidebar.expander("⏱️ Tempos desta execução", expanded=True):
+        st.caption(f"Total: {execucao['total_ms']:,.1f} ms")
+        st.dataframe(pd.DataFrame(execucao["etapas"]), hide_index=True, use_container_width=True)
+        if SEGUNDO_PLANO:
+            st.caption("Sincronizações em segundo plano (mais recentes)")
+            st.dataframe(pd.DataFrame(list(SEGUNDO_PLANO)[-10:]).drop(columns="em"), hide_index=True,
+                         use_container_width=True)
@@ -0,0 +1,284 @@
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from esquema import COLUNAS_DERIVADAS, centavos, centavos_do_df
+from medicao import medir
+
+# --- BANCO LOCAL DOS LANÇAMENTOS (SQLITE) ---
+# Alternativa ao Google Sheets: a planilha (ou um CSV no mesmo formato) é importada uma vez
+# para um arquivo SQLite, já tratada, e o dashboard passa a consultar o banco em vez de
+# carregar tudo. Os filtros de mês e categorias e as somas do mês viram consultas SQL,
+# então cada rerun lê só as linhas e os totais que vai mostrar.
+#   lancamentos: colunas da planilha + Mes_Ano, Mes_Ano_Exibicao, Is_Investimento, Status,
+#                Status_Grafico, Centavos e Centavos_Efetivo (o Valor_Efetivo em centavos)
+#   meta: versão dos dados (aumenta a cada importação) e a lista de colunas da planilha
+# Índices em (Mes_Ano, Categoria), para os filtros da sidebar, e em Data, para os saldos.
+# Os métodos de consulta têm os mesmos nomes do CuboLancamentos e do IndiceSaldo, então as
+# funções de figura do app.py funcionam com qualquer um dos dois.
+# Uso: python banco_lancamentos.py lancamentos.sqlite --csv planilha.csv
+#      python banco_lancamentos.py lancamentos.sqlite --credenciais credentials.json
+# No app.py, BANCO_LANCAMENTOS=<arquivo.sqlite> liga este modo.
+
+# Datas gravadas como texto ISO: a ordem do texto é a ordem das datas
+FORMATO_DATA = "%Y-%m-%d %H:%M:%S"
+INDICES = {
+    "idx_lancamentos_mes_categoria": "Mes_Ano, Categoria",
+    "idx_lancamentos_data": "Data",
+}
+
+
+def _nome(coluna):
+    # Nomes da planilha têm espaço e acento ("Recorrência"); sempre entre aspas no SQL
+    return '"' + coluna.replace('"', '""') + '"'
+
+
+def _texto_data(data):
+    return pd.Timestamp(data).strftime(FORMATO_DATA)
+
+
+def _em_lista(categorias):
+    # "Categoria IN (?, ?, ?)" com um marcador por categoria
+    return f"Categoria IN ({', '.join('?' * len(categorias))})", list(categorias)
+
+
+def tabela_banco(df):
+    # DataFrame tratado (tratamento.tratar_dados) -> linhas no formato da tabela lancamentos
+    colunas_planilha = [c for c in df.columns if c not in COLUNAS_DERIVADAS]
+    tabela = pd.DataFrame(index=df.index)
+    for coluna in colunas_planilha:
+        valores = df[coluna]
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            valores = valores.astype(object)
+        tabela[coluna] = valores
+    tabela["Data"] = df["Data"].dt.strftime(FORMATO_DATA)
+    tabela["Mes_Ano"] = np.asarray(df["Mes_Ano"], dtype=object)
+    tabela["Mes_Ano_Exibicao"] = np.asarray(df["Mes_Ano_Exibicao"], dtype=object)
+    tabela["Is_Investimento"] = df["Is_Investimento"].to_numpy(dtype="int64")
+    tabela["Status"] = np.asarray(df["Status"], dtype=object)
+    tabela["Status_Grafico"] = np.asarray(df["Status_Grafico"], dtype=object)
+    tabela["Centavos"] = centavos_do_df(df)
+    tabela["Centavos_Efetivo"] = centavos(df["Valor_Efetivo"])
+    return tabela, colunas_planilha
+
+
+class BancoLancamentos:
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+
+    def _conectar(self):
+        # Uma conexão por consulta: o Streamlit roda cada sessão numa thread
+        return sqlite3.connect(self.caminho)
+
+    def _consultar(self, sql, parametros=()):
+        with medir("banco: consulta"):
+            con = self._conectar()
+            try:
+                return pd.read_sql_query(sql, con, params=list(parametros))
+            finally:
+                con.close()
+
+    def _valor(self, sql, parametros=()):
+        con = self._conectar()
+        try:
+            linha = con.execute(sql, list(parametros)).fetchone()
+        finally:
+            con.close()
+        return linha[0] if linha else None
+
+    def _meta(self, chave, padrao=None):
+        try:
+            valor = self._valor("SELECT valor FROM meta WHERE chave = ?", [chave])
+        except sqlite3.OperationalError:
+            # Banco ainda sem importação nenhuma
+            return padrao
+        return padrao if valor is None else json.loads(valor)
+
+    # --- Importação ---
+    def importar(self, df):
+        # Troca todo o conteúdo pelo df tratado, numa transação só: quem estiver lendo
+        # continua vendo a versão anterior até o commit
+        tabela, colunas_planilha = tabela_banco(df)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        con = self._conectar()
+        try:
+            with medir("banco: importar"):
+                con.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+                anterior = con.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+                versao = (json.loads(anterior[0]) if anterior else 0) + 1
+                tabela.to_sql("lancamentos_novo", con, if_exists="replace", index=False)
+                with con:
+                    con.execute("BEGIN")
+                    con.execute("DROP TABLE IF EXISTS lancamentos")
+                    con.execute("ALTER TABLE lancamentos_novo RENAME TO lancamentos")
+                    for nome, colunas in INDICES.items():
+                        con.execute(f"CREATE INDEX {nome} ON lancamentos ({colunas})")
+                    con.executemany(
+                        "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+                        [
+                            ("versao", json.dumps(versao)),
+                            ("colunas", json.dumps(colunas_planilha, ensure_ascii=False)),
+                            ("importado_em", json.dumps(time.time())),
+                        ],
+                    )
+                con.execute("ANALYZE")
+        finally:
+            con.close()
+        return versao
+
+    @property
+    def versao(self):
+        return self._meta("versao", 0)
+
+    @property
+    def vazio(self):
+        return self.versao == 0
+
+    # --- Consultas usadas pelo app.py (mesmos nomes do CuboLancamentos) ---
+    def meses(self):
+        meses = self._consultar(
+            "SELECT Mes_Ano, MIN(Mes_Ano_Exibicao) AS Mes_Ano_Exibicao FROM lancamentos "
+            "GROUP BY Mes_Ano ORDER BY Mes_Ano DESC"
+        )
+        return meses[["Mes_Ano_Exibicao", "Mes_Ano"]]
+
+    def categorias(self):
+        return self._consultar(
+            "SELECT DISTINCT Categoria FROM lancamentos WHERE Categoria IS NOT NULL AND Categoria <> '' "
+            "ORDER BY Categoria"
+        )["Categoria"].tolist()
+
+    def primeira_data(self):
+        return pd.Timestamp(self._valor("SELECT MIN(Data) FROM lancamentos"))
+
+    def ultima_data(self, mes):
+        return pd.Timestamp(self._valor("SELECT MAX(Data) FROM lancamentos WHERE Mes_Ano = ?", [mes]))
+
+    def totais_mes(self, mes, categorias):
+        filtro, parametros = _em_lista(categorias)
+        totais = self._consultar(
+            f"SELECT Status, SUM(ABS(Centavos)) AS Centavos_Abs FROM lancamentos "
+            f"WHERE Mes_Ano = ? AND {filtro} GROUP BY Status",
+            [mes, *parametros],
+        ).set_index("Status")["Centavos_Abs"]
+        return totais.get("Receitas", 0) / 100, totais.get("Despesas", 0) / 100
+
+    def gastos_por_categoria(self, mes, categorias):
+        filtro, parametros = _em_lista(categorias)
+        return self._consultar(
+            f"SELECT Categoria, ABS(SUM(Centavos)) / 100.0 AS Valor FROM lancamentos "
+            f"WHERE Mes_Ano = ? AND {filtro} AND Status = 'Despesas' "
+            f"GROUP BY Categoria ORDER BY Valor DESC",
+            [mes, *parametros],
+        )
+
+    def gastos_por_recorrencia(self, mes, categorias):
+        filtro, parametros = _em_lista(categorias)
+        recorrencia = _nome("Recorrência")
+        return self._consultar(
+            f"SELECT {recorrencia}, SUM(ABS(Centavos)) / 100.0 AS Valor_Abs FROM lancamentos "
+            f"WHERE Mes_Ano = ? AND {filtro} AND Status = 'Despesas' AND {recorrencia} <> 'Receitas' "
+            f"GROUP BY {recorrencia} ORDER BY {recorrencia}",
+            [mes, *parametros],
+        )
+
+    def evolucao(self, categorias, mes=None):
+        filtro, parametros = _em_lista(categorias)
+        if mes is not None:
+            filtro += " AND Mes_Ano = ?"
+            parametros.append(mes)
+        df_plot = self._consultar(
+            f"SELECT Data, Status_Grafico AS Status, Categoria, SUM(Centavos) / 100.0 AS Valor FROM lancamentos "
+            f"WHERE {filtro} GROUP BY Data, Status_Grafico, Categoria ORDER BY Data",
+            parametros,
+        )
+        df_plot["Data"] = pd.to_datetime(df_plot["Data"], format=FORMATO_DATA)
+        df_plot["Valor_Grafico"] = df_plot["Valor"].abs()
+        return df_plot
+
+    def investimentos(self, mes=None, categorias=None):
+        filtro, parametros = "Is_Investimento = 1", []
+        if mes is not None:
+            filtro += " AND Mes_Ano = ?"
+            parametros.append(mes)
+        if categorias is not None:
+            filtro_categorias, parametros_categorias = _em_lista(categorias)
+            filtro += f" AND {filtro_categorias}"
+            parametros += parametros_categorias
+        df_invest = self._consultar(
+            f"SELECT Data, Categoria, SUM(Centavos) / 100.0 AS Valor FROM lancamentos "
+            f"WHERE {filtro} GROUP BY Data, Categoria ORDER BY Data, Categoria",
+            parametros,
+        )
+        df_invest["Data"] = pd.to_datetime(df_invest["Data"], format=FORMATO_DATA)
+        return df_invest
+
+    def lancamentos_do_mes(self, mes, categorias):
+        # Só as colunas da planilha, como vieram
+        filtro, parametros = _em_lista(categorias)
+        colunas = ", ".join(_nome(c) for c in self._meta("colunas", []))
+        df_mes = self._consultar(
+            f"SELECT {colunas} FROM lancamentos WHERE Mes_Ano = ? AND {filtro}",
+            [mes, *parametros],
+        )
+        df_mes["Data"] = pd.to_datetime(df_mes["Data"], format=FORMATO_DATA)
+        return df_mes
+
+    # --- Saldos (mesmos nomes do IndiceSaldo) ---
+    def saldo_ate(self, data):
+        total = self._valor("SELECT SUM(Centavos_Efetivo) FROM lancamentos WHERE Data <= ?", [_texto_data(data)])
+        return (total or 0) / 100
+
+    def investido_ate(self, data=None):
+        sql, parametros = "SELECT SUM(Centavos) FROM lancamentos WHERE Is_Investimento = 1", []
+        if data is not None:
+            sql += " AND Data <= ?"
+            parametros.append(_texto_data(data))
+        return (self._valor(sql, parametros) or 0) / 100
+
+
+def ler_planilha(cliente):
+    # Sincronização completa de todas as FONTES, com o mesmo tratamento do dashboard
+    from leitura_planilhas import LeitorPlanilhas
+    from sincronizacao import FONTES, SincronizadorPlanilha
+    from tratamento import tratar_dados
+
+    return SincronizadorPlanilha(LeitorPlanilhas(lambda: cliente), FONTES, tratar_dados).sincronizar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa a planilha de lançamentos para um banco SQLite local.")
+    parser.add_argument("banco", help="arquivo .sqlite de destino")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--csv", help="CSV no formato da planilha (o mesmo do PLANILHA_CSV)")
+    origem.add_argument("--credenciais", help="credentials.json da conta de serviço do Google")
+    args = parser.parse_args()
+
+    if args.csv:
+        from planilha_fake import ClienteFake
+        from sincronizacao import FONTES
+
+        arquivo, aba = FONTES[0]
+        cliente = ClienteFake.de_csv(args.csv, arquivo=arquivo, aba=aba)
+    else:
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        scope = ["https://www.googleapis.com/auth/spreadsheets",
+                 "https://www.googleapis.com/auth/drive"]
+        cliente = gspread.authorize(Credentials.from_service_account_file(args.credenciais, scopes=scope))
+
+    inicio = time.perf_counter()
+    df = ler_planilha(cliente)
+    versao = BancoLancamentos(args.banco).importar(df)
+    print(f"{len(df):,} lançamentos importados em {args.banco} (versão {versao}) "
+          f"em {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# --- BENCHMARK DO DASHBOARD SEM CREDENCIAIS ---
+# Gera uma planilha sintética, aponta o app.py para ela (PLANILHA_CSV) e roda o script sem
+# navegador com o AppTest do Streamlit, trocando mês, categorias, "ver tudo" e a ordenação.
+# Os tempos por etapa vêm do log da medicao.py.
+# Uso: python benchmark_dashboard.py --linhas 200000 --categorias 15 --meses 24 --saida resultado.json
+# Com --limite-ms, termina com erro se o p95 dos reruns passar do limite (para rodar antes do deploy).
+# Com --banco, a planilha é importada para um SQLite e o app roda no modo BANCO_LANCAMENTOS.
+
+PASTA = Path(__file__).parent
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    if not valores:
+        return 0.0
+    posicao = min(len(valores) - 1, max(0, round(p / 100 * (len(valores) - 1))))
+    return valores[posicao]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roda o app.py sem navegador sobre uma planilha sintética.")
+    parser.add_argument("--linhas", type=int, default=50_000)
+    parser.add_argument("--categorias", type=int, default=11)
+    parser.add_argument("--meses", type=int, default=12)
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--saida", help="arquivo JSON com o resultado")
+    parser.add_argument("--limite-ms", type=float, help="falha se o p95 dos reruns passar disso")
+    parser.add_argument("--banco", action="store_true", help="lê de um banco SQLite (banco_lancamentos.py)")
+    args = parser.parse_args()
+
+    temporaria = Path(tempfile.mkdtemp(prefix="benchmark_dashboard_"))
+    log = temporaria / "tempos.jsonl"
+    # Precisa estar definido antes de o app.py ser importado pelo AppTest
+    os.environ["PLANILHA_CSV"] = str(temporaria / "planilha.csv")
+    os.environ["DASHBOARD_CACHE"] = str(temporaria / "cache")
+    os.environ["MEDICAO_LOG"] = str(log)
+
+    sys.path.insert(0, str(PASTA))
+    from dados_sinteticos import categorias_sinteticas, gerar_lancamentos, salvar_csv
+    from medicao import ler_log
+    from streamlit.testing.v1 import AppTest
+
+    print(f"Gerando {args.linhas:,} lançamentos, {args.categorias} categorias, {args.meses} meses...")
+    salvar_csv(
+        gerar_lancamentos(args.linhas, categorias=categorias_sinteticas(args.categorias), meses=args.meses),
+        os.environ["PLANILHA_CSV"],
+    )
+    if args.banco:
+        from banco_lancamentos import BancoLancamentos, ler_planilha
+        from planilha_fake import ClienteFake
+        from sincronizacao import FONTES
+
+        arquivo, aba = FONTES[0]
+        os.environ["BANCO_LANCAMENTOS"] = str(temporaria / "lancamentos.sqlite")
+        BancoLancamentos(os.environ["BANCO_LANCAMENTOS"]).importar(
+            ler_planilha(ClienteFake.de_csv(os.environ["PLANILHA_CSV"], arquivo=arquivo, aba=aba))
+        )
+
+    app = AppTest.from_file(str(PASTA / "app.py"), default_timeout=600)
+
+    inicio = time.perf_counter()
+    app.run()
+    primeira = (time.perf_counter() - inicio) * 1000
+    if app.exception or app.error:
+        print("O app terminou com erro:", [e.value for e in app.exception] + [e.value for e in app.error])
+        sys.exit(1)
+
+    # Sequência de interações que se repete: outro mês, menos categorias, ver tudo, ordenação
+    meses = app.selectbox[0].options
+    categorias = list(app.multiselect[0].value)
+    interacoes = [
+        ("mês", lambda i: app.selectbox[0].set_value(meses[i % len(meses)])),
+        ("categorias", lambda i: app.multiselect[0].set_value(categorias[: max(1, len(categorias) - 1 - i % 3)])),
+        ("ver tudo", lambda i: app.checkbox[0].set_value(i % 2 == 0)),
+        ("ordenação", lambda i: app.radio[0].set_value(["Mais antigas", "Mais recentes"][i % 2])),
+    ]
+
+    reruns = {nome: [] for nome, _ in interacoes}
+    for i in range(args.reruns):
+        for nome, interagir in interacoes:
+            interagir(i + 1)
+            inicio = time.perf_counter()
+            app.run()
+            reruns[nome].append((time.perf_counter() - inicio) * 1000)
+            if app.exception:
+                print(f"Erro no rerun ({nome}):", [e.value for e in app.exception])
+                sys.exit(1)
+
+    # Tempo por etapa, somando todas as execuções registradas no log
+    etapas = {}
+    for execucao in ler_log(log):
+        for span in execucao["etapas"]:
+            etapas.setdefault(span["etapa"], []).append(span["ms"])
+
+    todos = [t for tempos in reruns.values() for t in tempos]
+    resultado = {
+        "parametros": vars(args),
+        "primeira_execucao_ms": primeira,
+        "reruns_ms": {
+            nome: {"p50": percentil(t, 50), "p95": percentil(t, 95)} for nome, t in reruns.items()
+        },
+        "reruns_p95_ms": percentil(todos, 95),
+        "etapas_ms": {
+            nome: {"n": len(t), "media": statistics.fmean(t), "max": max(t)} for nome, t in etapas.items()
+        },
+    }
+
+    print(f"\nPrimeira execução: {primeira:,.0f} ms")
+    print(f"{'Rerun':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    for nome, tempos in resultado["reruns_ms"].items():
+        print(f"{nome:<14}{tempos['p50']:>10.1f}{tempos['p95']:>10.1f}")
+    print(f"\n{'Etapa':<40}{'n':>5}{'média (ms)':>12}{'máx (ms)':>12}")
+    for nome, tempos in sorted(resultado["etapas_ms"].items(), key=lambda item: -item[1]["max"]):
+        print(f"{nome:<40}{tempos['n']:>5}{tempos['media']:>12.2f}{tempos['max']:>12.2f}")
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.limite_ms and resultado["reruns_p95_ms"] > args.limite_ms:
+        print(f"\np95 dos reruns ({resultado['reruns_p95_ms']:.0f} ms) passou do limite de {args.limite_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
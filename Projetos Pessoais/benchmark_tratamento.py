@@ -0,0 +1,73 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_lancamentos
+from tratamento import classificar_lancamentos, converter_valores_brl
+
+# --- BENCHMARK: TRATAMENTO ANTIGO x VETORIZADO ---
+# Uso: python benchmark_tratamento.py --linhas 1000000
+
+
+# Como o app.py fazia antes (cinco .str.replace e df.apply linha a linha)
+def valor_antigo(serie):
+    serie = (
+        serie
+        .astype(str)
+        .str.replace('R$', '', regex=False)
+        .str.replace(' ', '', regex=False)
+        .str.replace('.', '', regex=False)
+        .str.replace(',', '.', regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(serie, errors='coerce').fillna(0)
+
+
+def status_antigo(df):
+    def definir_status(row):
+        if "Investimento" in str(row['Categoria']):
+            return 'Receitas' if row['Valor'] < 0 else 'Despesas'
+        return 'Receitas' if row['Valor'] > 0 else 'Despesas'
+
+    return df.apply(definir_status, axis=1)
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o tratamento antigo do Valor/Status com o vetorizado.")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Gerando {args.linhas:,} lançamentos sintéticos...")
+    df = gerar_lancamentos(args.linhas)
+
+    t_valor_antigo, valor_a = medir(lambda: valor_antigo(df["Valor"]), args.repeticoes)
+    t_valor_novo, valor_n = medir(lambda: converter_valores_brl(df["Valor"]), args.repeticoes)
+    assert np.allclose(valor_a.to_numpy(), valor_n)
+
+    df_valores = df.assign(Valor=valor_n)
+    # O df.apply é lento demais para repetir; uma rodada basta
+    t_status_antigo, status_a = medir(lambda: status_antigo(df_valores), 1)
+    # A classificação da carga inteira (Is_Investimento, Valor_Efetivo, Status e Status_Grafico),
+    # como o tratar_dados roda; o antigo definir_status corresponde ao Status_Grafico
+    t_status_novo, df_classificado = medir(lambda: classificar_lancamentos(df_valores), args.repeticoes)
+    assert (status_a.to_numpy() == df_classificado["Status_Grafico"].to_numpy(dtype=object)).all()
+
+    print(f"{'Etapa':<10}{'Antigo (s)':>12}{'Novo (s)':>12}{'Ganho':>10}")
+    for etapa, antigo, novo in [("Valor", t_valor_antigo, t_valor_novo), ("Status", t_status_antigo, t_status_novo)]:
+        print(f"{etapa:<10}{antigo:>12.3f}{novo:>12.3f}{antigo / novo:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
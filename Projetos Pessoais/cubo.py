@@ -0,0 +1,169 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from esquema import centavos_do_df
+
+# --- CUBO DE AGREGADOS DO DASHBOARD ---
+# Os filtros da sidebar (mês, categorias, ver tudo) só recortam totais que não mudam entre
+# uma interação e outra. Em vez de refiltrar as linhas brutas a cada rerun, somamos tudo
+# uma vez por versão dos dados:
+#   mensal: Mes_Ano x Categoria x Status x Recorrência -> Centavos, Centavos_Abs, Quantidade
+#   diario: Data x Mes_Ano x Categoria x Is_Investimento x Status_Grafico -> Centavos (gráficos)
+# Status, Status_Grafico e Is_Investimento já vêm do tratamento (tratamento.classificar_lancamentos).
+# As somas são feitas em centavos inteiros (sem erro de arredondamento); Valor e Valor_Abs
+# em reais são derivados delas.
+# Quando a sincronização só acrescentou linhas, somamos o agregado delas ao cubo existente.
+
+CHAVES_MENSAL = ["Mes_Ano", "Categoria", "Status", "Recorrência"]
+CHAVES_DIARIO = ["Data", "Mes_Ano", "Categoria", "Is_Investimento", "Status_Grafico"]
+SOMAS_MENSAL = ["Centavos", "Centavos_Abs", "Quantidade"]
+SOMAS_DIARIO = ["Centavos"]
+
+
+def _em_reais(tabela):
+    tabela["Valor"] = tabela["Centavos"] / 100
+    if "Centavos_Abs" in tabela.columns:
+        tabela["Valor_Abs"] = tabela["Centavos_Abs"] / 100
+    return tabela
+
+
+def _agrupar(tabela, chaves, somas):
+    return _em_reais(tabela.groupby(chaves, sort=False, dropna=False, observed=True)[somas].sum().reset_index())
+
+
+def agregar(df):
+    centavos = centavos_do_df(df)
+    # .values mantém Categorical nas colunas do esquema compacto
+    base = pd.DataFrame({
+        "Data": df["Data"].values,
+        "Mes_Ano": df["Mes_Ano"].values,
+        "Categoria": df["Categoria"].values,
+        "Recorrência": df["Recorrência"].values,
+        "Is_Investimento": df["Is_Investimento"].values,
+        "Status": df["Status"].values,
+        "Status_Grafico": df["Status_Grafico"].values,
+        "Centavos": centavos,
+        "Centavos_Abs": np.abs(centavos),
+        "Quantidade": 1,
+    })
+    return _agrupar(base, CHAVES_MENSAL, SOMAS_MENSAL), _agrupar(base, CHAVES_DIARIO, SOMAS_DIARIO)
+
+
+def _somar(atual, novo, chaves, somas):
+    return _agrupar(pd.concat([atual, novo]), chaves, somas)
+
+
+class CuboLancamentos:
+    def __init__(self):
+        self.versao = None
+        # (mensal, diario) trocados juntos numa única atribuição
+        self.tabelas = None
+        self._trava = threading.Lock()
+
+    def _atual(self, versao):
+        # O cubo nunca volta para uma versão mais antiga: uma sessão atrasada (com o df de uma
+        # versão anterior) usa o cubo que já está mais à frente
+        return self.versao is not None and versao <= self.versao
+
+    def atualizar(self, df, versao, novos_desde=None):
+        if self._atual(versao):
+            return self
+        with self._trava:
+            if self._atual(versao):
+                return self
+            # Só as linhas entre a versão do cubo e a `versao` aplicada agora (a do df); se a
+            # sincronização já andou além dela, as linhas seguintes ficam para a próxima atualização
+            novos = novos_desde(self.versao, ate=versao) if novos_desde and self.versao is not None else None
+            if novos is None:
+                self.tabelas = agregar(df)
+            elif not novos.empty:
+                mensal, diario = self.tabelas
+                mensal_novo, diario_novo = agregar(novos)
+                self.tabelas = (
+                    _somar(mensal, mensal_novo, CHAVES_MENSAL, SOMAS_MENSAL),
+                    _somar(diario, diario_novo, CHAVES_DIARIO, SOMAS_DIARIO),
+                )
+            self.versao = versao
+        return self
+
+    # --- Consultas usadas pelo app.py ---
+    @property
+    def mensal(self):
+        return self.tabelas[0]
+
+    @property
+    def diario(self):
+        return self.tabelas[1]
+
+    def meses(self):
+        # Mais recente primeiro; o rótulo "MM/AAAA" é montado uma vez por mês distinto
+        meses = pd.Series(np.asarray(self.mensal["Mes_Ano"].unique(), dtype=object)).sort_values(ascending=False)
+        return pd.DataFrame({"Mes_Ano_Exibicao": meses.str[5:7] + "/" + meses.str[0:4], "Mes_Ano": meses})
+
+    def categorias(self):
+        return sorted([c for c in self.mensal["Categoria"].unique().tolist() if c and not pd.isna(c)])
+
+    def primeira_data(self):
+        return self.diario["Data"].min()
+
+    def ultima_data(self, mes):
+        diario = self.diario
+        return diario.loc[diario["Mes_Ano"] == mes, "Data"].max()
+
+    def recorte_mes(self, mes, categorias):
+        mensal = self.mensal
+        return mensal[(mensal["Mes_Ano"] == mes) & mensal["Categoria"].isin(categorias)]
+
+    def totais_mes(self, mes, categorias):
+        recorte = self.recorte_mes(mes, categorias)
+        receitas = recorte.loc[recorte["Status"] == "Receitas", "Centavos_Abs"].sum()
+        despesas = recorte.loc[recorte["Status"] == "Despesas", "Centavos_Abs"].sum()
+        return receitas / 100, despesas / 100
+
+    def saidas_mes(self, mes, categorias):
+        recorte = self.recorte_mes(mes, categorias)
+        return recorte[recorte["Status"] == "Despesas"]
+
+    def gastos_por_categoria(self, mes, categorias):
+        # Mesmo cálculo do groupby("Categoria")["Valor"].sum().abs() sobre as saídas
+        resumo = self.saidas_mes(mes, categorias).groupby("Categoria", observed=True)["Centavos"].sum().abs()
+        return (
+            (resumo / 100)
+            .rename("Valor")
+            .reset_index()
+            .sort_values(by="Valor", ascending=False)
+        )
+
+    def gastos_por_recorrencia(self, mes, categorias):
+        saidas = self.saidas_mes(mes, categorias)
+        resumo = saidas[saidas["Recorrência"] != "Receitas"].groupby("Recorrência", observed=True)["Centavos_Abs"].sum()
+        return (resumo / 100).rename("Valor_Abs").reset_index()
+
+    def evolucao(self, categorias, mes=None):
+        diario = self.diario
+        filtro = diario["Categoria"].isin(categorias)
+        if mes is not None:
+            filtro &= diario["Mes_Ano"] == mes
+        df_plot = (
+            diario[filtro]
+            .rename(columns={"Status_Grafico": "Status"})
+            .groupby(["Data", "Status", "Categoria"], observed=True)["Centavos"]
+            .sum()
+            .reset_index()
+        )
+        df_plot["Valor"] = df_plot.pop("Centavos") / 100
+        df_plot["Valor_Grafico"] = df_plot["Valor"].abs()
+        return df_plot
+
+    def investimentos(self, mes=None, categorias=None):
+        diario = self.diario
+        filtro = diario["Is_Investimento"].to_numpy(dtype=bool, copy=True)
+        if mes is not None:
+            filtro &= (diario["Mes_Ano"] == mes).to_numpy()
+        if categorias is not None:
+            filtro &= diario["Categoria"].isin(categorias).to_numpy()
+        df_invest = diario[filtro].groupby(["Data", "Categoria"], observed=True)["Centavos"].sum().reset_index()
+        df_invest["Valor"] = df_invest.pop("Centavos") / 100
+        return df_invest
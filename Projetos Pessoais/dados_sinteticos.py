@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# --- LANÇAMENTOS SINTÉTICOS ---
+# Gera uma planilha falsa no mesmo formato da "Controle de Gastos" (textos como a planilha mostra),
+# para benchmarks e para rodar o dashboard sem credenciais do Google.
+
+CATEGORIAS_PADRAO = [
+    "Salário", "Mercado", "Aluguel", "Transporte", "Lazer", "Saúde",
+    "Educação", "Assinaturas", "Restaurante", "Investimento - Renda Fixa", "Investimento - Ações",
+]
+RECORRENCIAS = ["Fixos", "Recorrentes", "Não Recorrentes"]
+
+
+def categorias_sinteticas(quantidade):
+    # As categorias padrão primeiro (Salário e investimentos incluídos); depois "Categoria N"
+    extras = [f"Categoria {i}" for i in range(1, max(0, quantidade - len(CATEGORIAS_PADRAO)) + 1)]
+    return (CATEGORIAS_PADRAO + extras)[:max(quantidade, 1)]
+
+
+def formatar_brl(valores):
+    # 1234.5 -> "R$ 1.234,50" | -10 -> "-R$ 10,00"
+    troca = str.maketrans({",": ".", ".": ","})
+    return [
+        f"{'-' if v < 0 else ''}R$ {abs(v):,.2f}".translate(troca)
+        for v in np.asarray(valores, dtype="float64").tolist()
+    ]
+
+
+def gerar_lancamentos(linhas, categorias=None, meses=12, inicio="2024-01-01", semente=0):
+    categorias = list(categorias or CATEGORIAS_PADRAO)
+    rng = np.random.default_rng(semente)
+
+    inicio = pd.Timestamp(inicio)
+    dias = (inicio + pd.DateOffset(months=meses) - inicio).days
+    datas = inicio + pd.to_timedelta(np.sort(rng.integers(0, dias, linhas)), unit="D")
+
+    categoria = np.asarray(categorias, dtype=object)[rng.integers(0, len(categorias), linhas)]
+    investimento = np.char.find(categoria.astype(str), "Investimento") >= 0
+    receita = np.isin(categoria, ["Salário"])
+
+    # Centavos inteiros para que o texto gerado seja exatamente o valor esperado
+    centavos = rng.integers(500, 50_000, linhas)
+    centavos = np.where(receita, centavos * 10, -centavos)
+    # Aplicações (positivas) e alguns resgates (negativos) nos investimentos
+    centavos = np.where(investimento, np.abs(centavos) * np.where(rng.random(linhas) < 0.2, -1, 1), centavos)
+
+    recorrencia = np.asarray(RECORRENCIAS, dtype=object)[rng.integers(0, len(RECORRENCIAS), linhas)]
+    recorrencia = np.where(receita, "Receitas", recorrencia)
+
+    return pd.DataFrame({
+        "Data": datas.strftime("%d/%m/%Y"),
+        "Descrição": [f"Lançamento {i}" for i in range(linhas)],
+        "Categoria": categoria,
+        "Valor": formatar_brl(centavos / 100),
+        "Recorrência": recorrencia,
+    })
+
+
+def linhas_planilha(df):
+    # Cabeçalho + linhas, no formato que a PlanilhaFake recebe
+    return [df.columns.tolist()] + df.astype(str).to_numpy().tolist()
+
+
+def salvar_csv(df, caminho):
+    # CSV que a PlanilhaFake.de_csv (e o app.py com PLANILHA_CSV) lê
+    df.to_csv(caminho, index=False, encoding="utf-8")
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- ESQUEMA COMPACTO DOS LANÇAMENTOS (OPCIONAL) ---
+# Ligado com a variável de ambiente ESQUEMA_COMPACTO=1. Vários dashboards dividem a mesma
+# instância pequena, então a memória do DataFrame conta:
+#   - Categoria e Recorrência viram category (poucos valores distintos, muitas linhas);
+#   - o mês vira um código inteiro (Mes_Codigo = ano * 12 + mês - 1) e os rótulos
+#     "AAAA-MM" / "MM/AAAA" são montados uma vez por mês distinto, como category;
+#   - Valor_Centavos guarda o valor em centavos inteiros, para os totais não acumularem
+#     erro de arredondamento. O Valor em float continua existindo para gráficos e tabelas.
+# relatorio_esquema.py compara memória e tempo com o formato padrão.
+
+COLUNAS_CATEGORICAS = ["Categoria", "Recorrência"]
+# Colunas criadas pelo tratamento, que não vieram da planilha
+COLUNAS_DERIVADAS = [
+    "Mes_Ano", "Mes_Ano_Exibicao", "Mes_Codigo", "Valor_Centavos", "Origem",
+    "Is_Investimento", "Valor_Efetivo", "Status", "Status_Grafico",
+]
+
+
+def esquema_compacto_ativo():
+    return os.environ.get("ESQUEMA_COMPACTO", "") == "1"
+
+
+def codigo_mes(datas):
+    datas = pd.DatetimeIndex(datas)
+    return (datas.year * 12 + datas.month - 1).to_numpy(dtype="int32")
+
+
+def rotulos_mes(codigos, categorico=False):
+    # Monta "AAAA-MM" e "MM/AAAA" só para os códigos distintos e espalha para as linhas
+    distintos, posicoes = np.unique(codigos, return_inverse=True)
+    anos, meses = np.divmod(distintos, 12)
+    mes_ano = [f"{a:04d}-{m + 1:02d}" for a, m in zip(anos.tolist(), meses.tolist())]
+    exibicao = [f"{m + 1:02d}/{a:04d}" for a, m in zip(anos.tolist(), meses.tolist())]
+    if categorico:
+        return (
+            pd.Categorical.from_codes(posicoes, mes_ano),
+            pd.Categorical.from_codes(posicoes, exibicao),
+        )
+    return np.asarray(mes_ano, dtype=object)[posicoes], np.asarray(exibicao, dtype=object)[posicoes]
+
+
+def centavos(valores):
+    return np.round(np.asarray(valores, dtype="float64") * 100).astype("int64")
+
+
+def compactar(df):
+    df = df.copy()
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype("category")
+    if "Data" in df.columns:
+        df["Mes_Codigo"] = codigo_mes(df["Data"])
+        df["Mes_Ano"], df["Mes_Ano_Exibicao"] = rotulos_mes(df["Mes_Codigo"].to_numpy(), categorico=True)
+    if "Valor" in df.columns:
+        df["Valor_Centavos"] = centavos(df["Valor"])
+    return df
+
+
+def centavos_do_df(df):
+    # Centavos de cada linha: a coluna do esquema compacto, ou o Valor arredondado
+    if "Valor_Centavos" in df.columns:
+        return df["Valor_Centavos"].to_numpy(dtype="int64")
+    return centavos(df["Valor"])
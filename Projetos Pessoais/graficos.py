@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+# --- REDUÇÃO DE PONTOS PARA OS GRÁFICOS DE EVOLUÇÃO ---
+# Com o histórico inteiro, cada ponto virava um marcador SVG no navegador. Acima de
+# LIMITE_PONTOS o gráfico passa a usar WebGL e cada série maior que isso é reduzida no servidor com o
+# LTTB (Largest-Triangle-Three-Buckets), que mantém picos e vales do desenho. Os pontos
+# escolhidos são linhas reais do DataFrame, então o hover continua mostrando a
+# Categoria e o Valor verdadeiros.
+
+LIMITE_PONTOS = 1000
+
+
+def lttb(x, y, n_saida):
+    # Devolve os índices dos pontos escolhidos (sempre inclui o primeiro e o último)
+    n = len(x)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    # n_saida - 2 baldes entre o primeiro e o último ponto
+    bordas = np.linspace(1, n - 1, n_saida - 1).astype("int64")
+
+    escolhidos = np.empty(n_saida, dtype="int64")
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_saida - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        # Média do balde seguinte (o último balde "seguinte" é só o ponto final)
+        prox_fim = bordas[i + 2] if i + 2 < len(bordas) else n
+        media_x = x[fim:prox_fim].mean()
+        media_y = y[fim:prox_fim].mean()
+        # Área do triângulo (ponto anterior, candidato, média do próximo balde)
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[i + 1] = anterior
+    return escolhidos
+
+
+def reduzir_series(df, x, y, serie, limite=LIMITE_PONTOS):
+    # Devolve (df para o gráfico, usar_webgl). Até o limite de pontos nada muda.
+    if len(df) <= limite:
+        return df, False
+
+    partes = []
+    for _, grupo in df.groupby(serie, sort=False, observed=True):
+        if len(grupo) > limite:
+            grupo = grupo.sort_values(x, kind="stable")
+            eixo_x = grupo[x].to_numpy()
+            if np.issubdtype(eixo_x.dtype, np.datetime64):
+                eixo_x = eixo_x.astype("int64")
+            grupo = grupo.iloc[lttb(eixo_x, grupo[y].to_numpy(), limite)]
+        partes.append(grupo)
+    return pd.concat(partes), True
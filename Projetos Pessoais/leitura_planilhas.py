@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from medicao import medir
+
+# --- LEITURA EM LOTE DE VÁRIAS PLANILHAS ---
+# Cada razão (por ano, por conta) pode estar numa aba ou num arquivo diferente. Todos os
+# intervalos pedidos para um mesmo arquivo vão numa única chamada values_batch_get, e os
+# arquivos diferentes são lidos em paralelo num pool com no máximo MAX_THREADS threads.
+# O cliente (gspread autorizado, ou o ClienteFake da planilha_fake.py) vem de fora e é
+# criado uma vez por processo.
+
+MAX_THREADS = 4
+
+
+def intervalo_na_aba(aba, intervalo=None):
+    # ("Controle de Gastos", "A2:F") -> "'Controle de Gastos'!A2:F"; sem intervalo, a aba inteira
+    nome = "'" + aba.replace("'", "''") + "'"
+    return nome if intervalo is None else f"{nome}!{intervalo}"
+
+
+class LeitorPlanilhas:
+    def __init__(self, obter_cliente, max_threads=MAX_THREADS):
+        self.obter_cliente = obter_cliente
+        self.max_threads = max_threads
+        # Arquivos já abertos (client.open faz uma busca por nome no Drive)
+        self._arquivos = {}
+
+    def _arquivo(self, nome):
+        if nome not in self._arquivos:
+            self._arquivos[nome] = self.obter_cliente().open(nome)
+        return self._arquivos[nome]
+
+    def _ler_arquivo(self, nome, intervalos):
+        resposta = self._arquivo(nome).values_batch_get(intervalos)
+        return [faixa.get("values", []) for faixa in resposta.get("valueRanges", [])]
+
+    def ler(self, pedidos):
+        # pedidos: lista de (arquivo, aba, intervalo A1 ou None para a aba inteira)
+        # Devolve os valores de cada pedido, na mesma ordem
+        por_arquivo = {}
+        for posicao, (arquivo, aba, intervalo) in enumerate(pedidos):
+            por_arquivo.setdefault(arquivo, []).append((posicao, intervalo_na_aba(aba, intervalo)))
+
+        resultado = [None] * len(pedidos)
+        if not por_arquivo:
+            return resultado
+
+        with medir("planilha: busca"), ThreadPoolExecutor(min(self.max_threads, len(por_arquivo))) as pool:
+            futuros = {
+                arquivo: pool.submit(self._ler_arquivo, arquivo, [intervalo for _, intervalo in itens])
+                for arquivo, itens in por_arquivo.items()
+            }
+            for arquivo, itens in por_arquivo.items():
+                for (posicao, _), valores in zip(itens, futuros[arquivo].result()):
+                    resultado[posicao] = valores
+        return resultado
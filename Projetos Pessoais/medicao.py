@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+# --- MEDIÇÃO DE TEMPO POR ETAPA ---
+# medir("nome") marca quanto tempo cada etapa levou (busca na planilha, tratamento, cubo,
+# cada figura, cada Styler...). Os tempos ficam na execução atual do script (uma por thread
+# do Streamlit); o que roda fora dela, como a sincronização em segundo plano, vai para
+# SEGUNDO_PLANO. Com MEDICAO_LOG=<arquivo.jsonl> cada execução é acrescentada ao log.
+
+SEGUNDO_PLANO = deque(maxlen=200)
+
+_local = threading.local()
+
+
+@contextmanager
+def medir(nome):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registro = {"etapa": nome, "ms": round((time.perf_counter() - inicio) * 1000, 3)}
+        spans = getattr(_local, "spans", None)
+        if spans is not None:
+            spans.append(registro)
+        else:
+            SEGUNDO_PLANO.append({**registro, "em": time.time()})
+
+
+def iniciar_execucao():
+    _local.spans = []
+    _local.inicio = time.perf_counter()
+
+
+def finalizar_execucao(**extras):
+    # Fecha a execução atual, grava no log (se configurado) e devolve o registro
+    spans = getattr(_local, "spans", None) or []
+    inicio = getattr(_local, "inicio", time.perf_counter())
+    registro = {
+        "em": time.time(),
+        "total_ms": round((time.perf_counter() - inicio) * 1000, 3),
+        "etapas": spans,
+        **extras,
+    }
+    _local.spans = None
+
+    caminho = os.environ.get("MEDICAO_LOG")
+    if caminho:
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+    return registro
+
+
+def medido(nome):
+    # Decorador para as seções em st.fragment: quando o fragmento roda sozinho (fora da
+    # execução do script), ele abre e fecha a própria execução
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            propria = getattr(_local, "spans", None) is None
+            if propria:
+                iniciar_execucao()
+            try:
+                with medir(nome):
+                    return funcao(*args, **kwargs)
+            finally:
+                if propria:
+                    finalizar_execucao(fragmento=nome)
+        return envolvida
+    return decorador
+
+
+def ler_log(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
@@ -0,0 +1,127 @@
+import csv
+import re
+
+# --- PLANILHA FALSA (SUBSTITUI O gspread.Worksheet LOCALMENTE) ---
+# Implementa só a parte da API do gspread que o dashboard usa, guardando as linhas em memória.
+# Serve para rodar a sincronização sem credenciais do Google e para conferir quantas
+# células cada sincronização realmente baixou.
+# ArquivoFake e ClienteFake fazem o papel do gspread.Spreadsheet e do gspread.Client, para a
+# leitura em lote de várias abas (leitura_planilhas.py).
+
+_A1 = re.compile(r"^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$")
+
+
+def _numero_coluna(letras):
+    numero = 0
+    for letra in letras:
+        numero = numero * 26 + (ord(letra) - ord("A") + 1)
+    return numero
+
+
+def _interpretar_intervalo(intervalo):
+    # "A2:F" -> (2, 1, None, 6) | "1:1" -> (1, 1, 1, None) | None -> planilha inteira
+    if not intervalo:
+        return 1, 1, None, None
+    if "!" in intervalo:
+        intervalo = intervalo.split("!", 1)[1]
+    encontrado = _A1.match(intervalo.replace("$", "").upper())
+    if not encontrado:
+        raise ValueError(f"Intervalo A1 inválido: {intervalo}")
+    col_ini, lin_ini, col_fim, lin_fim = encontrado.groups()
+    if col_fim is None and lin_fim is None:
+        col_fim, lin_fim = col_ini, lin_ini
+    return (
+        int(lin_ini) if lin_ini else 1,
+        _numero_coluna(col_ini) if col_ini else 1,
+        int(lin_fim) if lin_fim else None,
+        _numero_coluna(col_fim) if col_fim else None,
+    )
+
+
+class PlanilhaFake:
+    def __init__(self, linhas, title="Controle de Gastos"):
+        # linhas: lista de listas, a primeira é o cabeçalho (igual ao que a planilha mostra)
+        self.title = title
+        self.linhas = [[str(v) for v in linha] for linha in linhas]
+        self.chamadas = 0
+        self.celulas_lidas = 0
+
+    @classmethod
+    def de_csv(cls, caminho, title="Controle de Gastos"):
+        with open(caminho, newline="", encoding="utf-8") as arquivo:
+            return cls(list(csv.reader(arquivo)), title=title)
+
+    def _ler(self, intervalo):
+        lin_ini, col_ini, lin_fim, col_fim = _interpretar_intervalo(intervalo)
+        fim = len(self.linhas) if lin_fim is None else min(lin_fim, len(self.linhas))
+        valores = [linha[col_ini - 1:col_fim] for linha in self.linhas[lin_ini - 1:fim]]
+        # A API do Sheets corta as linhas vazias do final do intervalo
+        while valores and not any(valores[-1]):
+            valores.pop()
+        self.celulas_lidas += sum(len(linha) for linha in valores)
+        return valores
+
+    # --- API compatível com gspread.Worksheet ---
+    def get_values(self, range_name=None, **kwargs):
+        self.chamadas += 1
+        return self._ler(range_name)
+
+    def get_all_values(self, **kwargs):
+        return self.get_values()
+
+    def batch_get(self, ranges, **kwargs):
+        self.chamadas += 1
+        return [self._ler(intervalo) for intervalo in ranges]
+
+    def row_values(self, row, **kwargs):
+        self.chamadas += 1
+        return self._ler(f"{row}:{row}")[0] if row <= len(self.linhas) else []
+
+    def get_all_records(self, **kwargs):
+        cabecalho, *dados = self.get_values()
+        return [dict(zip(cabecalho, linha)) for linha in dados]
+
+    def append_row(self, values, **kwargs):
+        self.linhas.append([str(v) for v in values])
+
+    def append_rows(self, values, **kwargs):
+        for linha in values:
+            self.append_row(linha)
+
+    def update_row(self, row, values):
+        # Não existe no gspread; atalho para simular a edição de uma linha antiga
+        self.linhas[row - 1] = [str(v) for v in values]
+
+
+class ArquivoFake:
+    def __init__(self, abas, title="Controle Financeiro Mensal com Gráficos"):
+        # abas: dicionário nome da aba -> PlanilhaFake
+        self.title = title
+        self.abas = dict(abas)
+        self.chamadas = 0
+
+    def worksheet(self, nome):
+        return self.abas[nome]
+
+    def values_batch_get(self, ranges, **kwargs):
+        # "'Controle de Gastos'!A2:F" -> aba "Controle de Gastos", intervalo "A2:F"
+        self.chamadas += 1
+        faixas = []
+        for intervalo in ranges:
+            aba, _, a1 = intervalo.partition("!")
+            aba = aba[1:-1].replace("''", "'") if aba.startswith("'") else aba
+            faixas.append({"range": intervalo, "values": self.abas[aba]._ler(a1 or None)})
+        return {"valueRanges": faixas}
+
+
+class ClienteFake:
+    def __init__(self, arquivos):
+        # arquivos: lista de ArquivoFake
+        self.arquivos = {arquivo.title: arquivo for arquivo in arquivos}
+
+    @classmethod
+    def de_csv(cls, caminho, arquivo="Controle Financeiro Mensal com Gráficos", aba="Controle de Gastos"):
+        return cls([ArquivoFake({aba: PlanilhaFake.de_csv(caminho, title=aba)}, title=arquivo)])
+
+    def open(self, title):
+        return self.arquivos[title]
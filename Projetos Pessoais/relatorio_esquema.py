@@ -0,0 +1,92 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cubo import agregar
+from dados_sinteticos import gerar_lancamentos
+from esquema import codigo_mes, compactar, rotulos_mes
+from tratamento import classificar_lancamentos, converter_valores_brl
+
+# --- RELATÓRIO: ESQUEMA PADRÃO x COMPACTO ---
+# Uso: python relatorio_esquema.py --linhas 1000000
+# Mede a memória do DataFrame tratado e o tempo das operações que o dashboard repete.
+
+
+def tratar_padrao(df):
+    # Formato de antes: strings object e um strftime por linha para cada rótulo de mês
+    df = df.copy()
+    df["Valor"] = converter_valores_brl(df["Valor"])
+    df["Data"] = pd.to_datetime(df["Data"], dayfirst=True, errors="coerce")
+    df = df.dropna(subset=["Data"]).sort_values("Data")
+    df["Mes_Ano"] = df["Data"].dt.strftime("%Y-%m")
+    df["Mes_Ano_Exibicao"] = df["Data"].dt.strftime("%m/%Y")
+    # Colunas de classificação que o cubo lê (as mesmas do tratar_dados)
+    return classificar_lancamentos(df)
+
+
+def tratar_compacto(df):
+    df = df.copy()
+    df["Valor"] = converter_valores_brl(df["Valor"])
+    df["Data"] = pd.to_datetime(df["Data"], dayfirst=True, errors="coerce")
+    df = df.dropna(subset=["Data"]).sort_values("Data")
+    df["Mes_Ano"], df["Mes_Ano_Exibicao"] = rotulos_mes(codigo_mes(df["Data"]))
+    return compactar(classificar_lancamentos(df))
+
+
+def cronometrar(funcao, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def medir(df_bruto, tratar):
+    inicio = time.perf_counter()
+    df = tratar(df_bruto)
+    tempo_tratar = time.perf_counter() - inicio
+
+    mes = df["Mes_Ano"].iloc[len(df) // 2]
+    categorias = sorted(df["Categoria"].unique().tolist())[:-1]
+    return df, {
+        "Memória (MB)": df.memory_usage(deep=True).sum() / 1024 ** 2,
+        "Tratamento (s)": tempo_tratar,
+        "Filtro mês+categorias (s)": cronometrar(
+            lambda: df[(df["Mes_Ano"] == mes) & df["Categoria"].isin(categorias)]
+        ),
+        "Groupby categoria (s)": cronometrar(lambda: df.groupby("Categoria", observed=True)["Valor"].sum()),
+        "Cubo de agregados (s)": cronometrar(lambda: agregar(df), repeticoes=1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara memória e tempo do esquema padrão com o compacto.")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"Gerando {args.linhas:,} lançamentos sintéticos...")
+    df_bruto = gerar_lancamentos(args.linhas, meses=36)
+
+    df_padrao, padrao = medir(df_bruto, tratar_padrao)
+    df_compacto, compacto = medir(df_bruto, tratar_compacto)
+
+    # Soma em float x soma em centavos inteiros
+    total_exato = df_compacto["Valor_Centavos"].sum() / 100
+    deriva = abs(df_padrao["Valor"].to_numpy().cumsum()[-1] - total_exato)
+
+    print(f"{'Medida':<28}{'Padrão':>12}{'Compacto':>12}")
+    for medida in padrao:
+        print(f"{medida:<28}{padrao[medida]:>12.3f}{compacto[medida]:>12.3f}")
+    print(f"{'Deriva da soma float (R$)':<28}{deriva:>12.6f}{0:>12.6f}")
+
+    colunas = df_compacto.memory_usage(deep=True) / 1024 ** 2
+    print("\nMemória por coluna no esquema compacto (MB):")
+    print(colunas.round(2).to_string())
+    assert np.allclose(df_padrao["Valor"].to_numpy(), df_compacto["Valor"].to_numpy())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import numpy as np
+
+from esquema import centavos, centavos_do_df
+
+# --- ÍNDICE DE SALDO ACUMULADO (SOMAS DE PREFIXO POR DATA) ---
+# Guarda as datas ordenadas e a soma acumulada dos valores até cada linha, uma vez por
+# versão dos dados. "Saldo até a data X" vira uma busca binária nas datas, sem copiar
+# nem refiltrar o histórico. As somas são em centavos inteiros.
+#   saldo: soma do Valor_Efetivo (investimento com o sinal invertido: aplicação sai do saldo, resgate volta)
+#   investido: só as linhas de investimento, com o sinal original
+
+
+class IndiceSaldo:
+    def __init__(self, df):
+        ordem = np.argsort(df["Data"].to_numpy(), kind="stable")
+        valores = centavos_do_df(df)[ordem]
+        investimento = df["Is_Investimento"].to_numpy(dtype=bool)[ordem]
+
+        self.datas = df["Data"].to_numpy()[ordem]
+        self.saldo = np.cumsum(centavos(df["Valor_Efetivo"])[ordem])
+        self.investido = np.cumsum(np.where(investimento, valores, 0))
+
+    def _linhas_ate(self, data):
+        return int(np.searchsorted(self.datas, np.datetime64(data), side="right"))
+
+    def saldo_ate(self, data):
+        n = self._linhas_ate(data)
+        return self.saldo[n - 1] / 100 if n else 0.0
+
+    def investido_ate(self, data=None):
+        n = len(self.datas) if data is None else self._linhas_ate(data)
+        return self.investido[n - 1] / 100 if n else 0.0
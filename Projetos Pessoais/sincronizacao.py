@@ -0,0 +1,266 @@
+import copy
+import hashlib
+import threading
+import time
+
+import pandas as pd
+
+from medicao import medir
+
+# --- SINCRONIZAÇÃO INCREMENTAL DA PLANILHA ---
+# Em vez de baixar a planilha inteira a cada atualização, guardamos quantas linhas já foram
+# sincronizadas e buscamos só o que foi adicionado depois delas. As últimas linhas já
+# sincronizadas são relidas junto (janela de verificação): se alguma delas mudou, se linhas
+# sumiram ou se o cabeçalho mudou, refazemos a sincronização completa.
+# Edições em linhas mais antigas que a janela não aparecem nessa leitura, por isso
+# uma sincronização completa também é forçada de tempos em tempos (INTERVALO_COMPLETO).
+# Várias abas (fontes) podem ser sincronizadas juntas: cada uma tem o próprio estado, todas
+# são pedidas numa rodada só ao LeitorPlanilhas e as linhas vão para um único DataFrame,
+# com a coluna Origem dizendo de qual aba veio cada linha.
+# O estado de cada aba (linhas sincronizadas, assinatura da janela) só é trocado depois que o
+# DataFrame novo foi montado: se algo falha no meio, as abas continuam como na última versão.
+
+# Abas lidas pelo dashboard: (arquivo, aba). Outras abas ou arquivos com o mesmo cabeçalho
+# (um razão por ano, por conta...) podem entrar aqui; todas são lidas juntas em lote.
+FONTES = [("Controle Financeiro Mensal com Gráficos", "Controle de Gastos")]
+
+JANELA_VERIFICACAO = 50
+INTERVALO_COMPLETO = 30 * 60  # segundos
+# Quantas versões incrementais ficam guardadas para quem quiser atualizar agregados sem recalcular tudo
+VERSOES_GUARDADAS = 20
+
+
+def letra_coluna(numero):
+    # 1 -> A, 26 -> Z, 27 -> AA
+    letras = ""
+    while numero > 0:
+        numero, resto = divmod(numero - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+
+def assinatura(linhas):
+    h = hashlib.sha1()
+    for linha in linhas:
+        h.update("\x1f".join(linha).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def concatenar(df_a, df_b):
+    # pd.concat vira object quando as categorias das duas partes diferem; juntamos as categorias antes
+    for coluna in df_a.columns:
+        if isinstance(df_a[coluna].dtype, pd.CategoricalDtype) and isinstance(df_b[coluna].dtype, pd.CategoricalDtype):
+            categorias = df_a[coluna].cat.categories.union(df_b[coluna].cat.categories, sort=False)
+            df_a = df_a.assign(**{coluna: df_a[coluna].cat.set_categories(categorias)})
+            df_b = df_b.assign(**{coluna: df_b[coluna].cat.set_categories(categorias)})
+    return pd.concat([df_a, df_b])
+
+
+def _completar(linhas, largura):
+    # A API omite células vazias no fim da linha; igualamos todas à largura do cabeçalho
+    return [list(linha[:largura]) + [""] * (largura - len(linha)) for linha in linhas]
+
+
+class EstadoAba:
+    def __init__(self):
+        self.cabecalho = []
+        self.linhas_sincronizadas = 0
+        self.assinatura_janela = None
+        self.ultima_completa = 0.0
+
+
+def nome_origem(fonte):
+    arquivo, aba = fonte
+    return f"{arquivo}/{aba}"
+
+
+class SincronizadorPlanilha:
+    def __init__(self, leitor, fontes, tratar, janela=JANELA_VERIFICACAO, intervalo_completo=INTERVALO_COMPLETO):
+        # leitor: LeitorPlanilhas (ou qualquer objeto com ler(pedidos))
+        # fontes: lista de (arquivo, aba)
+        # tratar: função que recebe o DataFrame bruto e devolve o DataFrame limpo
+        self.leitor = leitor
+        self.fontes = [tuple(fonte) for fonte in fontes]
+        self.tratar = tratar
+        self.janela = janela
+        self.intervalo_completo = intervalo_completo
+
+        self.df = None
+        self.versao = 0
+        self.abas = {fonte: EstadoAba() for fonte in self.fontes}
+        self.ultimo_modo = None
+        # versao -> linhas (já tratadas) que entraram nela via sincronização incremental
+        self.novos = {}
+
+        self._trava = threading.Lock()
+
+    def _montar_df(self, fonte, cabecalho, linhas, inicio):
+        df_bruto = pd.DataFrame(_completar(linhas, len(cabecalho)), columns=cabecalho)
+        # O índice continua a numeração das linhas da planilha, como no get_all_records
+        df_bruto.index = pd.RangeIndex(inicio, inicio + len(df_bruto))
+        with medir("planilha: tratamento"):
+            df = self.tratar(df_bruto)
+        df["Origem"] = pd.Categorical([nome_origem(fonte)] * len(df))
+        return df
+
+    def _guardar_janela(self, estado, linhas):
+        estado.assinatura_janela = assinatura(linhas[max(0, len(linhas) - self.janela):] if self.janela else [])
+
+    def _pedido_incremental(self, fonte):
+        estado = self.abas[fonte]
+        inicio_janela = max(0, estado.linhas_sincronizadas - self.janela)
+        # +2: a linha 1 da planilha é o cabeçalho e o A1 começa em 1
+        return [(*fonte, "1:1"), (*fonte, f"A{inicio_janela + 2}:{letra_coluna(len(estado.cabecalho))}")]
+
+    def _aplicar_completa(self, fonte, valores):
+        # Devolve (DataFrame da aba, estado novo da aba); o estado só entra em self.abas no fim
+        estado = EstadoAba()
+        estado.cabecalho = valores[0] if valores else []
+        dados = _completar(valores[1:], len(estado.cabecalho))
+        estado.linhas_sincronizadas = len(dados)
+        self._guardar_janela(estado, dados)
+        estado.ultima_completa = time.monotonic()
+        return self._montar_df(fonte, estado.cabecalho, dados, 0), estado
+
+    def _aplicar_incremental(self, fonte, cabecalho, cauda):
+        # Devolve (DataFrame das linhas novas, estado novo da aba), ou None se a aba precisa de
+        # sincronização completa
+        estado = copy.copy(self.abas[fonte])
+        cabecalho = cabecalho[0] if cabecalho else []
+        if cabecalho != estado.cabecalho:
+            return None
+
+        cauda = _completar(cauda, len(estado.cabecalho))
+        tamanho_janela = estado.linhas_sincronizadas - max(0, estado.linhas_sincronizadas - self.janela)
+        if len(cauda) < tamanho_janela or assinatura(cauda[:tamanho_janela]) != estado.assinatura_janela:
+            return None
+
+        novas = cauda[tamanho_janela:]
+        if not novas:
+            return self.df.iloc[0:0], estado
+        df_novos = self._montar_df(fonte, estado.cabecalho, novas, estado.linhas_sincronizadas)
+        estado.linhas_sincronizadas += len(novas)
+        self._guardar_janela(estado, cauda)
+        return df_novos, estado
+
+    def _precisa_completa(self, fonte, forcar_completa):
+        estado = self.abas[fonte]
+        expirou = time.monotonic() - estado.ultima_completa > self.intervalo_completo
+        return self.df is None or forcar_completa or expirou or not estado.cabecalho
+
+    def _sincronizar(self, forcar_completa):
+        completas = [f for f in self.fontes if self._precisa_completa(f, forcar_completa)]
+        incrementais = [f for f in self.fontes if f not in completas]
+
+        # Rodada 1: todas as abas de uma vez (uma chamada por arquivo, arquivos em paralelo)
+        pedidos = [(*fonte, None) for fonte in completas]
+        for fonte in incrementais:
+            pedidos += self._pedido_incremental(fonte)
+        respostas = self.leitor.ler(pedidos)
+
+        valores_completos = dict(zip(completas, respostas[:len(completas)]))
+        novos = {}
+        # Estados novos das abas, aplicados só depois de self.df ser trocado
+        estados = {}
+        resto = respostas[len(completas):]
+        for i, fonte in enumerate(incrementais):
+            resultado = self._aplicar_incremental(fonte, resto[2 * i], resto[2 * i + 1])
+            if resultado is None:
+                completas.append(fonte)
+                continue
+            df_novos, estados[fonte] = resultado
+            if not df_novos.empty:
+                novos[fonte] = df_novos
+
+        # Rodada 2: abas em que a verificação da janela falhou
+        refazer = [fonte for fonte in completas if fonte not in valores_completos]
+        if refazer:
+            valores_completos.update(zip(refazer, self.leitor.ler([(*fonte, None) for fonte in refazer])))
+
+        if completas:
+            # Linhas das abas refeitas substituem as antigas; as demais abas ficam como estão
+            partes = []
+            for fonte in completas:
+                df_fonte, estados[fonte] = self._aplicar_completa(fonte, valores_completos[fonte])
+                partes.append(df_fonte)
+            if self.df is not None and len(completas) < len(self.fontes):
+                refeitas = [nome_origem(fonte) for fonte in completas]
+                partes.insert(0, self.df[~self.df["Origem"].isin(refeitas)])
+            partes += list(novos.values())
+            self.ultimo_modo = "completa"
+        elif novos:
+            partes = [self.df, *novos.values()]
+            self.ultimo_modo = "incremental"
+        else:
+            self.ultimo_modo = "incremental"
+            return self.df
+
+        df = partes[0]
+        for parte in partes[1:]:
+            df = concatenar(df, parte)
+        if "Data" in df.columns:
+            df = df.sort_values("Data", kind="stable")
+        self.df = df
+        self.abas.update(estados)
+
+        self.versao += 1
+        if completas:
+            self.novos.clear()
+        else:
+            df_novos = list(novos.values())
+            self.novos[self.versao] = df_novos[0] if len(df_novos) == 1 else pd.concat(df_novos)
+            self.novos.pop(self.versao - VERSOES_GUARDADAS, None)
+        return self.df
+
+    def novos_desde(self, desde, ate=None):
+        # Linhas acrescentadas depois de `desde` até a versão `ate` (inclusive; padrão: a atual).
+        # None se no caminho houve sincronização completa ou se o intervalo não existe
+        with self._trava:
+            ate = self.versao if ate is None else ate
+            faltando = range(desde + 1, ate + 1)
+            if desde > ate or ate > self.versao or any(v not in self.novos for v in faltando):
+                return None
+            if not faltando:
+                return self.df.iloc[0:0]
+            return pd.concat([self.novos[v] for v in faltando])
+
+    # --- Estado (para retomar a partir de um snapshot salvo em disco) ---
+    def estado(self):
+        # ultima_completa vira horário de relógio para continuar valendo depois de reiniciar o processo
+        agora, agora_monotonic = time.time(), time.monotonic()
+        return {
+            "versao": self.versao,
+            "abas": [
+                {
+                    "fonte": list(fonte),
+                    "cabecalho": estado.cabecalho,
+                    "linhas_sincronizadas": estado.linhas_sincronizadas,
+                    "assinatura_janela": estado.assinatura_janela,
+                    "completa_em": agora - (agora_monotonic - estado.ultima_completa),
+                }
+                for fonte, estado in self.abas.items()
+            ],
+        }
+
+    def restaurar(self, df, estado):
+        with self._trava:
+            salvas = {tuple(aba["fonte"]): aba for aba in estado.get("abas", [])}
+            if set(salvas) != set(self.fontes):
+                # Snapshot antigo ou lista de fontes diferente: não dá para continuar dele
+                return False
+            agora, agora_monotonic = time.time(), time.monotonic()
+            for fonte, aba in salvas.items():
+                estado_aba = self.abas[fonte]
+                estado_aba.cabecalho = aba["cabecalho"]
+                estado_aba.linhas_sincronizadas = aba["linhas_sincronizadas"]
+                estado_aba.assinatura_janela = aba["assinatura_janela"]
+                estado_aba.ultima_completa = agora_monotonic - (agora - aba["completa_em"])
+            self.df = df
+            self.versao = estado["versao"]
+            self.novos.clear()
+            return True
+
+    def sincronizar(self, forcar_completa=False):
+        with self._trava:
+            return self._sincronizar(forcar_completa)
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# --- SNAPSHOT EM DISCO + ATUALIZAÇÃO EM SEGUNDO PLANO ---
+# O DataFrame já tratado é salvo em Parquet a cada versão nova. Quando o processo sobe
+# (deploy, container novo, cache limpo), o snapshot é servido na hora e uma thread em
+# segundo plano sincroniza com a planilha e troca a versão em uso quando terminar.
+# Só a primeira execução, sem snapshot nenhum, espera pela planilha.
+
+INTERVALO_ATUALIZACAO = 60  # segundos, o mesmo ttl que o load_data usava
+# Muda quando as colunas do DataFrame tratado mudam; snapshot de outro formato é ignorado
+# e a primeira carga volta a ler a planilha inteira
+FORMATO_SNAPSHOT = 2
+
+
+def _escrever_atomico(caminho, escrever):
+    # Escreve num arquivo temporário e troca de uma vez, para nunca deixar um snapshot pela metade
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.tmp")
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+
+class CacheLancamentos:
+    def __init__(self, sincronizador, caminho, intervalo=INTERVALO_ATUALIZACAO):
+        self.sincronizador = sincronizador
+        self.caminho = Path(caminho)
+        self.caminho_meta = self.caminho.with_suffix(".json")
+        self.intervalo = intervalo
+
+        # (df, versao) trocados juntos numa única atribuição
+        self.atual = None
+        self.ultimo_erro = None
+
+        self._trava_carga = threading.Lock()
+        self._trava_atualizacao = threading.Lock()
+        self._thread = None
+
+    # --- Snapshot ---
+    def carregar_snapshot(self):
+        if not (self.caminho.exists() and self.caminho_meta.exists()):
+            return False
+        try:
+            df = pd.read_parquet(self.caminho)
+            meta = json.loads(self.caminho_meta.read_text(encoding="utf-8"))
+        except Exception as e:
+            self.ultimo_erro = e
+            return False
+
+        if meta.get("formato") != FORMATO_SNAPSHOT:
+            return False
+        if not self.sincronizador.restaurar(df, meta["sincronizacao"]):
+            return False
+        self.atual = (df, meta["sincronizacao"]["versao"])
+        return True
+
+    def salvar_snapshot(self, df):
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"formato": FORMATO_SNAPSHOT, "salvo_em": time.time(), "sincronizacao": self.sincronizador.estado()}
+        _escrever_atomico(self.caminho, lambda destino: df.to_parquet(destino))
+        _escrever_atomico(
+            self.caminho_meta,
+            lambda destino: destino.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8"),
+        )
+
+    # --- Atualização ---
+    def atualizar(self):
+        with self._trava_atualizacao:
+            versao_anterior = self.atual[1] if self.atual else None
+            df = self.sincronizador.sincronizar()
+            versao = self.sincronizador.versao
+            if versao != versao_anterior:
+                self.atual = (df, versao)
+                self.salvar_snapshot(df)
+            return self.atual
+
+    def _laco(self):
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.atualizar()
+                self.ultimo_erro = None
+            except Exception as e:
+                # Continua servindo a última versão boa e tenta de novo no próximo ciclo
+                self.ultimo_erro = e
+
+    def _iniciar_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco, name="atualiza-lancamentos", daemon=True)
+            self._thread.start()
+
+    def obter(self):
+        # Devolve (df, versao)
+        if self.atual is None:
+            with self._trava_carga:
+                if self.atual is None:
+                    if self.carregar_snapshot():
+                        # Snapshot servido; a primeira sincronização já roda em segundo plano
+                        threading.Thread(target=self._atualizar_silencioso, daemon=True).start()
+                    else:
+                        self.atualizar()
+                    self._iniciar_thread()
+        return self.atual
+
+    def _atualizar_silencioso(self):
+        try:
+            self.atualizar()
+        except Exception as e:
+            self.ultimo_erro = e
+
+    @property
+    def versao(self):
+        return self.atual[1] if self.atual else 0
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from esquema import codigo_mes, compactar, esquema_compacto_ativo, rotulos_mes
+from medicao import medir
+
+# --- CONVERSÃO DE VALORES E CLASSIFICAÇÃO DOS LANÇAMENTOS ---
+# Funções vetorizadas usadas pelo dashboard. A planilha repete muito os mesmos textos
+# (valores como "R$ 50,00" e as mesmas categorias), então o trabalho com texto é feito
+# só nos valores distintos (pd.factorize) e depois espalhado para as linhas com indexação NumPy.
+
+# "R$ -1.234,56" -> "-1234.56" numa única passada: tira R, $, espaços e pontos de milhar
+# e troca a vírgula decimal por ponto
+_TABELA_BRL = str.maketrans({"R": None, "$": None, " ": None, "\xa0": None, ".": None, ",": "."})
+
+
+def converter_valores_brl(valores):
+    codigos, distintos = pd.factorize(valores, use_na_sentinel=True)
+    textos = pd.Series(distintos, dtype=object).astype(str).str.translate(_TABELA_BRL).str.strip()
+    numeros = pd.to_numeric(textos, errors="coerce").fillna(0).to_numpy(dtype="float64")
+    # Células vazias (NaN) ficam com 0, como no fillna(0) de antes
+    return np.where(codigos >= 0, numeros[codigos] if len(numeros) else 0.0, 0.0)
+
+
+def separar_receitas(investimento, valores):
+    # A regra de receitas e despesas, num lugar só: para investimento o sinal é invertido
+    # (resgate, negativo, é receita; aplicação, positiva, é despesa); para as demais categorias
+    # receita é o valor positivo e despesa o negativo. Valor zero não é nenhum dos dois.
+    receita = np.where(investimento, valores < 0, valores > 0)
+    despesa = np.where(investimento, valores > 0, valores < 0)
+    return receita, despesa
+
+
+# --- CLASSIFICAÇÃO NA CARGA ---
+# Colunas calculadas uma vez por versão dos dados (no tratar_dados), para que cubo,
+# saldos e gráficos leiam a regra pronta em vez de procurar "Investimento" de novo:
+#   Is_Investimento: a categoria contém "Investimento" (sem diferenciar maiúsculas)
+#   Valor_Efetivo: efeito no saldo (investimento com o sinal invertido: aplicação sai, resgate volta)
+#   Status: Receitas / Despesas / "" (valor zero) pela separar_receitas
+#   Status_Grafico: Receitas / Despesas para o gráfico de evolução; mesma regra, mas o gráfico
+#     sempre diferenciou maiúsculas em "Investimento" e põe o valor zero em Despesas
+# O texto das categorias é examinado uma vez por categoria distinta; Status e Status_Grafico
+# ficam como category (2 ou 3 valores repetidos em todas as linhas).
+def classificar_lancamentos(df):
+    codigos, distintos = pd.factorize(df["Categoria"], use_na_sentinel=True)
+    textos = pd.Series(distintos, dtype=object).astype(str)
+    # Um False no fim: o código -1 (categoria vazia) cai nele
+    marcas = {}
+    for case in (False, True):
+        marca = textos.str.contains("Investimento", case=case, regex=False).to_numpy(dtype=bool)
+        marcas[case] = np.append(marca, False)[codigos]
+    valores = df["Valor"].to_numpy(dtype="float64")
+
+    df = df.copy()
+    df["Is_Investimento"] = marcas[False]
+    df["Valor_Efetivo"] = np.where(marcas[False], -valores, valores)
+    receita, despesa = separar_receitas(marcas[False], valores)
+    df["Status"] = pd.Categorical(np.select([receita, despesa], ["Receitas", "Despesas"], ""), categories=["Receitas", "Despesas", ""])
+    receita_grafico, _ = separar_receitas(marcas[True], valores)
+    df["Status_Grafico"] = pd.Categorical(np.where(receita_grafico, "Receitas", "Despesas"), categories=["Receitas", "Despesas"])
+    return df
+
+
+# --- TRATAMENTO DA PLANILHA ---
+# Recebe o DataFrame bruto lido da planilha e devolve o limpo. Usado pelo sincronizador do
+# app.py e pelo banco_lancamentos.py ao importar a planilha para o SQLite.
+def tratar_dados(df):
+    if 'Valor' in df.columns:
+        with medir("tratamento: valor"):
+            df['Valor'] = converter_valores_brl(df['Valor'])
+
+    if 'Data' in df.columns:
+        with medir("tratamento: datas"):
+            df['Data'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
+            df = df.dropna(subset=['Data']).sort_values('Data')
+            # Rótulos montados uma vez por mês distinto, em vez de um strftime por linha
+            df['Mes_Ano'], df['Mes_Ano_Exibicao'] = rotulos_mes(codigo_mes(df['Data']))
+
+    if 'Categoria' in df.columns and 'Valor' in df.columns:
+        # Investimento, valor efetivo e Status calculados uma vez aqui; o resto do app só lê as colunas
+        with medir("tratamento: classificação"):
+            df = classificar_lancamentos(df)
+
+    if esquema_compacto_ativo():
+        with medir("tratamento: esquema compacto"):
+            df = compactar(df)
+
+    return df
@@ -0,0 +1,94 @@
+import numpy as np
+
+# --- FÓRMULAS DOS EXERCÍCIOS E005 A E015 EM LOTE ---
+# As mesmas contas dos exercícios, mas recebendo arrays do NumPy em vez de um valor do input():
+# cada função faz a conta para todos os valores de uma vez e devolve um dicionário
+# nome da saída -> array. Listas e números soltos também funcionam (viram array).
+# EXERCICIOS diz quais entradas cada exercício pede, na ordem dos input() originais;
+# o lote.py usa essa tabela para ler os arquivos.
+
+COTACAO_DOLAR = 3.27
+
+
+def antecessor_sucessor(n):
+    # E005
+    n = np.asarray(n)
+    return {"antecessor": n - 1, "sucessor": n + 1}
+
+
+def dobro_triplo_raiz(n):
+    # E006
+    n = np.asarray(n)
+    return {"dobro": n * 2, "triplo": n * 3, "raiz": n ** (1 / 2)}
+
+
+def media(n1, n2):
+    # E007
+    return {"media": (np.asarray(n1) + np.asarray(n2)) / 2}
+
+
+def converter_metros(m):
+    # E008
+    m = np.asarray(m)
+    return {"cm": m * 100, "mm": m * 1000, "km": m / 1000}
+
+
+def tabuada(t):
+    # E009: uma coluna por multiplicador (t x 1 até t x 10)
+    t = np.asarray(t)
+    return {f"x{i}": t * i for i in range(1, 11)}
+
+
+def reais_para_dolares(q, cotacao=COTACAO_DOLAR):
+    # E010: divisão inteira, como no exercício (só dólares inteiros)
+    return {"dolares": np.asarray(q) // cotacao}
+
+
+def area_e_tinta(largura, altura):
+    # E011: 1 litro de tinta a cada 2 m²
+    area = np.asarray(largura) * np.asarray(altura)
+    return {"area": area, "tinta": area / 2}
+
+
+def desconto(preco):
+    # E012: promoção de 15%
+    return {"preco_com_desconto": np.asarray(preco) * 0.85}
+
+
+def aumento(salario):
+    # E013: aumento de 30%
+    return {"novo_salario": np.asarray(salario) * 1.30}
+
+
+def celsius_para_fahrenheit(celsius):
+    # E014
+    return {"fahrenheit": (np.asarray(celsius) * 9) / 5 + 32}
+
+
+def aluguel_carro(km, dias):
+    # E015: R$ 0,15 por km rodado e R$ 60,00 por dia
+    return {"pago": (np.asarray(km) * 0.15) + (np.asarray(dias) * 60)}
+
+
+# exercício -> (entradas, função)
+EXERCICIOS = {
+    "E005": (["n"], antecessor_sucessor),
+    "E006": (["n"], dobro_triplo_raiz),
+    "E007": (["n1", "n2"], media),
+    "E008": (["m"], converter_metros),
+    "E009": (["t"], tabuada),
+    "E010": (["q"], reais_para_dolares),
+    "E011": (["largura", "altura"], area_e_tinta),
+    "E012": (["preco"], desconto),
+    "E013": (["salario"], aumento),
+    "E014": (["celsius"], celsius_para_fahrenheit),
+    "E015": (["km", "dias"], aluguel_carro),
+}
+
+
+def calcular(exercicio, *entradas):
+    # calcular("E015", [100, 250], [2, 3]) -> {"pago": array([135. , 217.5])}
+    nomes, funcao = EXERCICIOS[exercicio]
+    if len(entradas) != len(nomes):
+        raise ValueError(f"{exercicio} pede {len(nomes)} entrada(s): {', '.join(nomes)}")
+    return funcao(*entradas)
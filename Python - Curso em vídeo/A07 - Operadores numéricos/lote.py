@@ -0,0 +1,76 @@
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from formulas import EXERCICIOS
+
+# --- EXERCÍCIOS DA A07 EM LOTE (ARQUIVO DE ENTRADA -> CSV DE SAÍDA) ---
+# Lê as entradas de um arquivo em blocos, faz a conta do exercício para o bloco inteiro
+# (formulas.py) e acrescenta o resultado no CSV de saída. Só um bloco fica na memória por vez,
+# então um milhão de orçamentos de aluguel ocupa o mesmo que mil.
+# Formatos de entrada:
+#   - CSV com cabeçalho usando os nomes das entradas (E015: km,dias);
+#   - arquivo de coluna, um valor por linha (ou várias colunas, na ordem das entradas), com
+#     --sem-cabecalho;
+#   - .npy do NumPy: 1 dimensão para uma entrada, ou uma coluna por entrada. É aberto com
+#     mmap, então também não é lido inteiro.
+# A saída tem as colunas de entrada seguidas das calculadas.
+# Uso: python lote.py E015 alugueis.csv orcamentos.csv --bloco 100000
+#      python lote.py E014 temperaturas.txt fahrenheit.csv --sem-cabecalho
+
+TAMANHO_BLOCO = 100_000
+
+
+def blocos_csv(caminho, nomes, tamanho_bloco, cabecalho=True):
+    opcoes = {"usecols": nomes} if cabecalho else {"header": None, "names": nomes}
+    yield from pd.read_csv(caminho, chunksize=tamanho_bloco, **opcoes)
+
+
+def blocos_npy(caminho, nomes, tamanho_bloco):
+    dados = np.load(caminho, mmap_mode="r")
+    if dados.ndim == 1:
+        dados = dados.reshape(-1, 1)
+    if dados.shape[1] != len(nomes):
+        raise ValueError(f"{caminho} tem {dados.shape[1]} coluna(s), o exercício pede {len(nomes)}: {', '.join(nomes)}")
+    for inicio in range(0, len(dados), tamanho_bloco):
+        yield pd.DataFrame(np.asarray(dados[inicio:inicio + tamanho_bloco]), columns=nomes)
+
+
+def processar(exercicio, entrada, saida, tamanho_bloco=TAMANHO_BLOCO, cabecalho=True):
+    # Devolve quantas linhas foram calculadas
+    nomes, funcao = EXERCICIOS[exercicio]
+    if Path(entrada).suffix == ".npy":
+        blocos = blocos_npy(entrada, nomes, tamanho_bloco)
+    else:
+        blocos = blocos_csv(entrada, nomes, tamanho_bloco, cabecalho)
+
+    linhas = 0
+    for numero, bloco in enumerate(blocos):
+        resultado = funcao(*(bloco[nome].to_numpy() for nome in nomes))
+        bloco = bloco.assign(**resultado)
+        bloco.to_csv(saida, mode="w" if numero == 0 else "a", header=numero == 0, index=False)
+        linhas += len(bloco)
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roda um exercício da A07 para todos os valores de um arquivo.")
+    parser.add_argument("exercicio", choices=sorted(EXERCICIOS))
+    parser.add_argument("entrada", help="CSV, arquivo de coluna (--sem-cabecalho) ou .npy")
+    parser.add_argument("saida", help="CSV de saída")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco")
+    parser.add_argument("--sem-cabecalho", action="store_true", help="a entrada não tem linha de cabeçalho")
+    args = parser.parse_args()
+
+    try:
+        linhas = processar(args.exercicio, args.entrada, args.saida, args.bloco, cabecalho=not args.sem_cabecalho)
+    except ValueError as erro:
+        sys.exit(f"Erro: {erro}")
+    print(f"{linhas:,} linhas calculadas ({args.exercicio}) em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+# --- REGRAS POR FAIXA (E029, E031 E E034) ---
+# Os três exercícios são o mesmo if/else: o valor cai numa faixa e a faixa diz a conta.
+#   E029: até 80 km/h não há multa; acima, (velocidade - 80) * 7
+#   E031: até 200 km a passagem é distância * 0.50; acima, distância * 0.45
+#   E034: até R$ 1250 o salário vai a salário * 1.15; acima, salário * 1.10
+# As faixas ficam em regras.json (dá para mudar um limite ou uma taxa sem mexer no código).
+# Cada faixa tem "ate" (limite, inclusivo, como o <= dos exercícios), "taxa" e "descontar"
+# (opcional, subtraído antes de multiplicar); a última faixa não tem limite.
+#     resultado = (valor - descontar) * taxa
+# compilar() transforma a regra em arrays de limites, taxas e descontos; aplicar a regra num
+# array é uma busca binária (np.searchsorted) para achar a faixa de cada valor e uma conta,
+# sem if por valor.
+
+CAMINHO_REGRAS = Path(__file__).parent / "regras.json"
+
+
+class RegraFaixas:
+    def __init__(self, nome, faixas, entrada="valor", saida="resultado", descricao=""):
+        self.nome = nome
+        self.entrada = entrada
+        self.saida = saida
+        self.descricao = descricao
+
+        if not faixas:
+            raise ValueError(f"{nome}: a regra precisa de pelo menos uma faixa")
+        if any("ate" not in faixa for faixa in faixas[:-1]) or "ate" in faixas[-1]:
+            raise ValueError(f"{nome}: só a última faixa pode (e deve) ficar sem limite (\"ate\")")
+        limites = [float(faixa["ate"]) for faixa in faixas[:-1]]
+        if any(a >= b for a, b in zip(limites, limites[1:])):
+            raise ValueError(f"{nome}: os limites das faixas precisam ser crescentes: {limites}")
+
+        # Última faixa com limite infinito: todo valor cai em alguma faixa
+        self.limites = np.array(limites + [np.inf])
+        self.taxas = np.array([float(faixa["taxa"]) for faixa in faixas])
+        self.descontos = np.array([float(faixa.get("descontar", 0)) for faixa in faixas])
+
+    def faixa(self, valores):
+        # Índice da faixa de cada valor: a primeira cujo limite é >= valor. Valores vazios (NaN)
+        # ficam depois do infinito na busca; vão para a última faixa e o resultado continua NaN
+        faixa = np.searchsorted(self.limites, np.asarray(valores, dtype="float64"), side="left")
+        return np.minimum(faixa, len(self.limites) - 1)
+
+    def __call__(self, valores):
+        valores = np.asarray(valores, dtype="float64")
+        faixa = self.faixa(valores)
+        return (valores - self.descontos[faixa]) * self.taxas[faixa]
+
+
+def compilar(nome, definicao):
+    return RegraFaixas(nome, definicao["faixas"], definicao.get("entrada", "valor"),
+                       definicao.get("saida", "resultado"), definicao.get("descricao", ""))
+
+
+def carregar_regras(caminho=CAMINHO_REGRAS):
+    definicoes = json.loads(Path(caminho).read_text(encoding="utf-8"))
+    return {nome: compilar(nome, definicao) for nome, definicao in definicoes.items()}
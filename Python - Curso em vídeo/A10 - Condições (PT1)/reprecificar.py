@@ -0,0 +1,56 @@
+import argparse
+import sys
+
+import pandas as pd
+
+from regras import CAMINHO_REGRAS, carregar_regras
+
+# --- REPRECIFICAÇÃO EM LOTE COM AS REGRAS POR FAIXA ---
+# Aplica uma regra do regras.json (E029, E031 ou E034) a todos os valores de um arquivo,
+# lendo em blocos: só um bloco fica na memória, então um arquivo com milhões de passagens
+# ou salários é reprecificado com memória constante. Quando um limite ou uma taxa muda,
+# basta editar o regras.json (ou passar outro com --regras) e rodar de novo.
+# A entrada é um CSV com a coluna da regra (E031: distancia) ou, com --sem-cabecalho, um
+# valor por linha. A saída repete a entrada e acrescenta a coluna calculada (E031: preco).
+# Uso: python reprecificar.py E031 viagens.csv precos.csv --bloco 500000
+#      python reprecificar.py E034 salarios.txt reajustes.csv --sem-cabecalho --regras regras_2027.json
+
+TAMANHO_BLOCO = 100_000
+
+
+def reprecificar(regra, entrada, saida, tamanho_bloco=TAMANHO_BLOCO, cabecalho=True):
+    # Devolve quantas linhas foram calculadas
+    opcoes = {} if cabecalho else {"header": None, "names": [regra.entrada]}
+    linhas = 0
+    for numero, bloco in enumerate(pd.read_csv(entrada, chunksize=tamanho_bloco, **opcoes)):
+        if regra.entrada not in bloco.columns:
+            raise ValueError(f"{entrada} não tem a coluna \"{regra.entrada}\" pedida pela regra {regra.nome}")
+        bloco[regra.saida] = regra(bloco[regra.entrada].to_numpy())
+        bloco.to_csv(saida, mode="w" if numero == 0 else "a", header=numero == 0, index=False)
+        linhas += len(bloco)
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica uma regra por faixa (regras.json) a um arquivo inteiro.")
+    parser.add_argument("regra", help="nome da regra no regras.json (E029, E031, E034)")
+    parser.add_argument("entrada", help="CSV com a coluna de entrada, ou um valor por linha (--sem-cabecalho)")
+    parser.add_argument("saida", help="CSV de saída")
+    parser.add_argument("--regras", default=CAMINHO_REGRAS, help="arquivo de regras (padrão: regras.json)")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco")
+    parser.add_argument("--sem-cabecalho", action="store_true", help="a entrada não tem linha de cabeçalho")
+    args = parser.parse_args()
+
+    try:
+        regras = carregar_regras(args.regras)
+        if args.regra not in regras:
+            raise ValueError(f"regra {args.regra} não existe; disponíveis: {', '.join(regras)}")
+        regra = regras[args.regra]
+        linhas = reprecificar(regra, args.entrada, args.saida, args.bloco, cabecalho=not args.sem_cabecalho)
+    except ValueError as erro:
+        sys.exit(f"Erro: {erro}")
+    print(f"{linhas:,} linhas calculadas com a regra {regra.nome} ({regra.descricao}) em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()